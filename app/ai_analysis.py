@@ -0,0 +1,440 @@
+"""
+Gemini resume analysis, run as background jobs (``AIAnalysisJob``).
+
+The view only validates the upload and creates a job; the Gemini round trip
+(often 10-60 s) happens on a small thread pool, so it no longer ties up a
+web worker. The model's output is streamed into a JobStream as it arrives;
+the SSE endpoint (stream_job_events) turns it into one event per finished
+company / study-plan section. The stream is an async generator, so under
+ASGI an open stream costs a coroutine rather than a worker; it is only
+offered when ``AI_STREAM_ENABLED`` is set. Otherwise, and for clients
+without EventSource, the dashboard polls the job's status endpoint.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .ai_cache import analysis_cache_key, get_analysis_cache
+from .ai_hedge import DeadlineExceeded, HedgeError, LatencyTracker, get_call_executor, hedge_delay, hedged_call
+from .ai_providers import get_provider
+from .ai_stream import JobStream, StreamClaim, sse_event
+from .json_stream import IncrementalJSONParser
+from .models import AIAnalysisJob, AnalysisResult
+from .text_compaction import COMPACTION_VERSION, compact_text
+
+logger = logging.getLogger(__name__)
+
+# Study-plan sections in the order the results page shows them
+STUDY_PLAN_SECTIONS = [
+    "overview",
+    "timeline",
+    "skill_gaps",
+    "weekly_schedule",
+    "recommended_courses",
+    "practice_projects",
+    "certifications",
+]
+
+# Latencies of successful Gemini calls, used to pick the hedge delay
+_latencies = LatencyTracker()
+
+
+class AnalysisError(Exception):
+    pass
+
+
+def build_prompt(resume_text):
+    return f"""Analyze the following resume and provide detailed career recommendations in JSON format.
+
+Resume Content:
+{resume_text}
+
+Please provide a JSON response with the following structure:
+{{
+    "top_companies": [
+        {{
+            "name": "Company Name",
+            "location": "City, State/Country",
+            "match_reason": "Why this company matches the candidate",
+            "hiring_process": "Step-by-step hiring process (interview rounds, tests, etc.)",
+            "study_resources": ["Resource 1", "Resource 2", "Resource 3"]
+        }}
+    ],
+    "study_plan": {{
+        "overview": "Overall study plan description for the candidate",
+        "timeline": "Suggested timeline (e.g., 3 months, 6 months)",
+        "weekly_schedule": [
+            {{
+                "day": "Monday",
+                "topics": ["Topic 1", "Topic 2"],
+                "hours": 2,
+                "activities": "Description of activities"
+            }}
+        ],
+        "skill_gaps": ["Skill 1 to improve", "Skill 2 to learn"],
+        "recommended_courses": [
+            {{
+                "name": "Course Name",
+                "platform": "Platform (Coursera, Udemy, etc.)",
+                "duration": "Duration",
+                "description": "Why this course is recommended"
+            }}
+        ],
+        "practice_projects": [
+            {{
+                "title": "Project Title",
+                "description": "Project description",
+                "technologies": ["Tech 1", "Tech 2"],
+                "difficulty": "Beginner/Intermediate/Advanced"
+            }}
+        ],
+        "certifications": [
+            {{
+                "name": "Certification Name",
+                "issuer": "Issuing Organization",
+                "importance": "Why this certification matters"
+            }}
+        ]
+    }}
+}}
+
+Provide exactly 10 companies that would be a good fit based on the candidate's skills, experience, and qualifications. Include:
+- Real companies that actually hire for these roles
+- Specific locations (cities)
+- Detailed hiring processes (e.g., "1. Online Application 2. Phone Screen 3. Technical Assessment 4. On-site Interview 5. HR Round")
+- Practical study resources (courses, books, websites, certifications)
+
+Create a comprehensive study plan that includes:
+- Weekly schedule with specific topics and activities
+- Skill gaps to address
+- Recommended courses with platforms and durations
+- Practice projects to build portfolio
+- Important certifications to pursue
+
+Return ONLY valid JSON, no additional text."""
+
+
+# Changes whenever the prompt wording changes, so cached analyses produced by
+# an older prompt are not reused.
+PROMPT_VERSION = hashlib.sha256(build_prompt("").encode("utf-8")).hexdigest()[:12]
+
+
+def _clean_response_text(response_text):
+    # Remove markdown code blocks if present
+    response_text = response_text.strip()
+    if response_text.startswith("```json"):
+        response_text = response_text[7:]
+    if response_text.startswith("```"):
+        response_text = response_text[3:]
+    if response_text.endswith("```"):
+        response_text = response_text[:-3]
+    return response_text.strip()
+
+
+def analyze_text(resume_text, provider=None, stream=None):
+    """
+    Run the analysis prompt, hedging across the provider's models
+    (app/ai_hedge.py). Partial output of the leading model is published to
+    ``stream`` (a JobStream) if given. Returns ``(data, model_name)``;
+    raises AnalysisError.
+    """
+    provider = provider or get_provider()
+    prompt = build_prompt(resume_text)
+    model_names = provider.models()
+    claim = StreamClaim(stream) if stream is not None else None
+    stop = threading.Event()
+
+    def attempt(model_name, timeout):
+        started = time.monotonic()
+        parts = []
+        try:
+            for chunk in provider.stream(model_name, prompt, timeout):
+                if stop.is_set():
+                    raise AnalysisError("Cancelled: another model answered first")
+                parts.append(chunk)
+                if claim is not None:
+                    claim.publish(model_name, "".join(parts))
+            text = "".join(parts)
+            if not text:
+                raise Exception("Empty response from model")
+        except Exception:
+            if not stop.is_set():
+                provider.mark_failed(model_name)
+            if claim is not None:
+                claim.release(model_name)
+            raise
+        provider.mark_ok(model_name)
+        _latencies.record(time.monotonic() - started)
+        try:
+            # Invalid JSON counts as a failed attempt, so another model can win
+            data = json.loads(_clean_response_text(text))
+        except ValueError:
+            if claim is not None:
+                claim.release(model_name)
+            raise
+        return data, text
+
+    try:
+        (data, text), model_name = hedged_call(
+            model_names,
+            attempt,
+            deadline=getattr(settings, "AI_ANALYSIS_DEADLINE", 90),
+            delay=hedge_delay(_latencies),
+            executor=get_call_executor(),
+        )
+    except HedgeError as e:
+        last_error = e if isinstance(e, DeadlineExceeded) or not e.errors else e.errors[-1][1]
+        if isinstance(last_error, json.JSONDecodeError):
+            raise AnalysisError(f"AI response parsing failed: {last_error}") from e
+        error_msg = f"Failed to generate response from {provider.label} API.\n"
+        error_msg += f"Tried models: {', '.join(name for name, _ in e.errors) or ', '.join(model_names)}\n"
+        error_msg += f"Last error: {last_error}\n\n"
+        error_msg += "Please check:\n"
+        error_msg += "1. Your API key is valid and has access to Gemini models\n"
+        error_msg += "2. Your API key has not exceeded quota\n"
+        error_msg += "3. The model names are correct for your API version"
+        raise AnalysisError(error_msg) from e
+    finally:
+        # Streaming losers stop at their next chunk
+        stop.set()
+    if claim is not None:
+        # The winner's full answer replaces what another model may have streamed
+        claim.finish(model_name, text)
+    return data, model_name
+
+
+def analyze_text_cached(resume_text, stream=None):
+    """
+    analyze_text() behind the analysis cache. Returns ``(data, model_name,
+    source)`` with source "cache", "shared" or "computed".
+    """
+    provider = get_provider()
+
+    def compute():
+        data, model_name = analyze_text(resume_text, provider, stream)
+        return {"data": data, "model_name": model_name}
+
+    # A change to the compaction rules invalidates analyses cached under the old ones
+    key = analysis_cache_key(resume_text, f"{provider.name}-{PROMPT_VERSION}-c{COMPACTION_VERSION}")
+    entry, source = get_analysis_cache().get_or_compute(key, compute)
+    return entry["data"], entry["model_name"], source
+
+
+# -- background execution ------------------------------------------------------
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide thread pool, sized by ``AI_ANALYSIS_WORKERS``."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "AI_ANALYSIS_WORKERS", 4),
+                    thread_name_prefix="ai-analysis",
+                )
+    return _executor
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def enqueue_analysis(user, document):
+    """Create a queued job for this document and start it once committed."""
+    job = AIAnalysisJob.objects.create(user=user, document=document)
+    transaction.on_commit(lambda: get_executor().submit(run_analysis_job, job.id))
+    return job
+
+
+def run_analysis_job(job_id):
+    """Run one queued job and record the outcome and timings on its row."""
+    close_old_connections()
+    try:
+        claimed = AIAnalysisJob.objects.filter(id=job_id, status=AIAnalysisJob.QUEUED).update(
+            status=AIAnalysisJob.RUNNING,
+            started_at=timezone.now(),
+        )
+        if not claimed:
+            return job_id
+        job = AIAnalysisJob.objects.select_related("document").get(id=job_id)
+        try:
+            if job.document is None or not job.document.text:
+                raise AnalysisError("The uploaded document is no longer available.")
+            compacted = compact_text(job.document.text)
+            AIAnalysisJob.objects.filter(id=job_id).update(
+                input_chars=compacted.original_chars,
+                prompt_chars=compacted.compacted_chars,
+            )
+            logger.info(
+                "AI analysis job %s: resume text %d -> %d chars (~%d tokens, %.0f%% smaller%s)",
+                job_id,
+                compacted.original_chars,
+                compacted.compacted_chars,
+                compacted.compacted_tokens,
+                compacted.reduction * 100,
+                ", capped" if compacted.truncated else "",
+            )
+            stream = JobStream(job_id)
+            data, model_name, source = analyze_text_cached(compacted.text, stream)
+        except Exception as e:
+            if not isinstance(e, AnalysisError):
+                logger.exception("AI analysis job %s failed", job_id)
+            AIAnalysisJob.objects.filter(id=job_id).update(
+                status=AIAnalysisJob.FAILED,
+                error=str(e)[:2000],
+                finished_at=timezone.now(),
+            )
+        else:
+            analysis = AnalysisResult(user_id=job.user_id, document=job.document, model_name=model_name)
+            analysis.data = data
+            analysis.save()
+            AIAnalysisJob.objects.filter(id=job_id).update(
+                status=AIAnalysisJob.DONE,
+                analysis=analysis,
+                model_name=model_name,
+                cache_hit=source != "computed",
+                finished_at=timezone.now(),
+            )
+    finally:
+        close_old_connections()
+    return job_id
+
+
+def expire_stale_job(job):
+    """
+    Fail a job that has been pending longer than ``AI_ANALYSIS_TIMEOUT``
+    (e.g. its process was restarted). Returns True if the job was expired.
+    """
+    if job.status not in (AIAnalysisJob.QUEUED, AIAnalysisJob.RUNNING):
+        return False
+    timeout = getattr(settings, "AI_ANALYSIS_TIMEOUT", 300)
+    if (timezone.now() - job.created_at).total_seconds() < timeout:
+        return False
+    job.status = AIAnalysisJob.FAILED
+    job.error = "The analysis took too long. Please try again."
+    job.finished_at = timezone.now()
+    updated = AIAnalysisJob.objects.filter(id=job.id, status__in=[AIAnalysisJob.QUEUED, AIAnalysisJob.RUNNING]).update(
+        status=job.status, error=job.error, finished_at=job.finished_at
+    )
+    if not updated:
+        job.refresh_from_db()
+    return bool(updated)
+
+
+# -- Server-Sent Events ----------------------------------------------------------
+
+def _analysis_items(data):
+    """(kind, key, value) for every renderable part of an analysis."""
+    if not isinstance(data, dict):
+        return
+    companies = data.get("top_companies")
+    if isinstance(companies, list):
+        for index, company in enumerate(companies):
+            yield "company", index, company
+    study_plan = data.get("study_plan")
+    if isinstance(study_plan, dict):
+        for key, value in study_plan.items():
+            yield "study_plan", key, value
+
+
+def _analysis_data(job):
+    return job.analysis.data if job.analysis_id else {}
+
+
+async def stream_job_events(job, render_item, status_payload):
+    """
+    Yield SSE events for a job until it finishes: ``status`` on changes,
+    ``item`` for each completed company or study-plan section (rendered
+    with ``render_item(kind, key, value)``), ``reset`` if the streaming
+    model was replaced, then ``done`` or ``failed`` (or ``timeout``).
+    """
+    poll = getattr(settings, "AI_STREAM_POLL_INTERVAL", 0.25)
+    max_seconds = getattr(settings, "AI_STREAM_MAX_SECONDS", 120)
+    started = time.monotonic()
+    last_db_check = last_sent = 0.0
+    last_status = None
+    stream = JobStream(job.id)
+    generation, offset = None, 0
+    parser = None
+    sent = {}  # (kind, key) -> value as sent
+
+    def item_event(kind, key, value):
+        sent[(kind, key)] = value
+        return sse_event("item", {"kind": kind, "key": key, "html": render_item(kind, key, value)})
+
+    while True:
+        now = time.monotonic()
+        if now - last_db_check >= 1.0:
+            last_db_check = now
+            await job.arefresh_from_db()
+            await sync_to_async(expire_stale_job)(job)
+            if job.status != last_status:
+                last_status = job.status
+                last_sent = now
+                yield sse_event("status", status_payload(job))
+
+        if job.status == AIAnalysisJob.DONE:
+            # Whatever didn't arrive through the stream (cache hits, the
+            # final throttled chunk) comes from the stored result. If the
+            # result differs from what was streamed (a hedged call won while
+            # the model owning the stream was still going), start over.
+            data = await sync_to_async(_analysis_data)(job)
+            final = {(kind, key): value for kind, key, value in _analysis_items(data)}
+            if any(final.get(item) != value for item, value in sent.items()):
+                yield sse_event("reset", {})
+                sent.clear()
+            for kind, key, value in _analysis_items(data):
+                if (kind, key) not in sent:
+                    yield item_event(kind, key, value)
+            yield sse_event("done", status_payload(job))
+            await stream.aclear()
+            return
+        if job.status == AIAnalysisJob.FAILED:
+            yield sse_event("failed", status_payload(job))
+            await stream.aclear()
+            return
+
+        current_generation, text = await stream.aread()
+        if current_generation != generation:
+            if sent:
+                yield sse_event("reset", {})
+            sent.clear()
+            generation, offset = current_generation, 0
+            parser = IncrementalJSONParser(depth=2)
+        if len(text) > offset and parser is not None:
+            try:
+                completed = parser.feed(text[offset:])
+            except ValueError:
+                # Malformed stream; the final result will fill in the rest
+                parser, completed = None, []
+            offset = len(text)
+            for (section, key), value in completed:
+                kind = "company" if section == "top_companies" else section
+                if kind in ("company", "study_plan"):
+                    last_sent = now
+                    yield item_event(kind, key, value)
+
+        if now - started > max_seconds:
+            yield sse_event("timeout", status_payload(job))
+            return
+        if now - last_sent > 15:
+            last_sent = now
+            yield ": keepalive\n\n"
+        await asyncio.sleep(poll)
@@ -0,0 +1,119 @@
+"""
+Cache of parsed Gemini analyses, keyed by normalized resume text and the
+prompt version.
+
+Entries live in the ``AI_ANALYSIS_CACHE_ALIAS`` Django cache, which provides
+the TTL and eviction. Concurrent misses for the same key in this process are
+collapsed into one upstream call: the first caller runs it, the others wait
+for its result.
+"""
+import hashlib
+import threading
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def normalize_text(text):
+    """Collapse whitespace so trivially different extractions share a key."""
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def analysis_cache_key(resume_text, prompt_version):
+    digest = hashlib.sha256(normalize_text(resume_text).encode("utf-8")).hexdigest()
+    return f"ai-analysis:{prompt_version}:{digest}"
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Return ``(result, shared)``; ``shared`` is True for waiting callers."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class AnalysisCache:
+    def __init__(self, alias, timeout=None):
+        self.alias = alias
+        self.timeout = timeout
+        self.flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "shared": 0}
+
+    @property
+    def cache(self):
+        # Cache connections are per thread; look the alias up on every use
+        return caches[self.alias]
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Return ``(value, source)`` where source is "cache", "shared" (waited
+        on a concurrent call) or "computed". Only successful results are stored.
+        """
+        value = self.cache.get(key)
+        if value is not None:
+            self._count("hits")
+            return value, "cache"
+
+        def load():
+            # Another process (or a just-finished leader) may have filled it.
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached, "cache"
+            computed = compute()
+            self.cache.set(key, computed, self.timeout)
+            return computed, "computed"
+
+        (value, source), shared = self.flight.do(key, load)
+        if shared:
+            self._count("shared")
+            return value, "shared"
+        self._count("hits" if source == "cache" else "misses")
+        return value, source
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalysisCache(
+                    alias=getattr(settings, "AI_ANALYSIS_CACHE_ALIAS", "default"),
+                    timeout=getattr(settings, "AI_ANALYSIS_CACHE_TTL", 7 * 24 * 3600),
+                )
+    return _cache
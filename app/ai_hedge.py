@@ -0,0 +1,127 @@
+"""
+Hedged, deadline-bounded calls across a list of Gemini models.
+
+The first model is called straight away. If it has not answered within the
+hedge delay (a percentile of recent successful latencies), the next model is
+called as well, and so on; a failed call starts the next model immediately.
+The first valid result wins and the remaining calls are cancelled. Nothing
+runs past the overall deadline.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+
+class HedgeError(Exception):
+    """No model produced a valid result; ``errors`` is a list of (model, error)."""
+
+    def __init__(self, message, errors):
+        super().__init__(message)
+        self.errors = errors
+
+
+class DeadlineExceeded(HedgeError):
+    pass
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies."""
+
+    def __init__(self, window=200, min_samples=5):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct):
+        """The ``pct`` percentile in seconds, or None without enough samples."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[round(pct / 100 * (len(ordered) - 1))]
+
+
+def hedge_delay(tracker):
+    """Seconds to wait on a call before hedging to the next model."""
+    observed = tracker.percentile(getattr(settings, "AI_HEDGE_PERCENTILE", 90))
+    if observed is None:
+        return getattr(settings, "AI_HEDGE_DEFAULT_DELAY", 15.0)
+    return max(getattr(settings, "AI_HEDGE_MIN_DELAY", 2.0), observed)
+
+
+def hedged_call(candidates, attempt, deadline, delay, executor, clock=time.monotonic):
+    """
+    Call ``attempt(candidate, timeout)`` for candidates in order, hedging
+    after ``delay`` seconds, within ``deadline`` seconds overall. Returns
+    ``(result, candidate)`` for the first call that returns; raises
+    HedgeError (or DeadlineExceeded) otherwise.
+    """
+    end = clock() + deadline
+    queue = list(candidates)
+    pending = {}
+    errors = []
+    next_hedge = None
+
+    def launch():
+        nonlocal next_hedge
+        candidate = queue.pop(0)
+        future = executor.submit(attempt, candidate, max(end - clock(), 0.1))
+        pending[future] = candidate
+        next_hedge = clock() + delay
+
+    try:
+        while pending or queue:
+            if not pending:
+                launch()
+            now = clock()
+            if now >= end:
+                raise DeadlineExceeded(f"No model answered within {deadline:g}s", errors)
+            wake_at = min(end, next_hedge) if queue else end
+            done, _ = wait(pending, timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                candidate = pending.pop(future)
+                try:
+                    return future.result(), candidate
+                except Exception as e:
+                    errors.append((candidate, e))
+            # A failure moves on to the next model without waiting.
+            if queue and (done or clock() >= next_hedge):
+                launch()
+        raise HedgeError("All models failed", errors)
+    finally:
+        # Calls already in flight can't be interrupted; their results are
+        # dropped and their own timeout bounds them.
+        for future in pending:
+            future.cancel()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_call_executor():
+    """Threads for upstream model calls, separate from the job threads."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "AI_MODEL_CALL_WORKERS", 8),
+                    thread_name_prefix="ai-model-call",
+                )
+    return _executor
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,129 @@
+"""
+Process-wide registry of the Gemini models available to our API key.
+
+``genai.list_models()`` is a network round trip, so it is done once and the
+result is kept for ``GEMINI_MODELS_TTL`` seconds. After that the stale list
+is still served while a background thread refreshes it. Models that fail a
+request are skipped for ``GEMINI_MODEL_FAILURE_COOLDOWN`` seconds.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Preferred models, fastest/cheapest first. A model discovered through
+# list_models() is tried before these.
+DEFAULT_MODELS = [
+    "gemini-1.5-flash",
+    "gemini-1.5-pro",
+]
+
+
+def _list_generate_models(genai):
+    names = []
+    for m in genai.list_models():
+        if "generateContent" in getattr(m, "supported_generation_methods", ()):
+            names.append(m.name.replace("models/", "") if hasattr(m, "name") else str(m))
+    return names
+
+
+class ModelRegistry:
+    def __init__(self, genai, api_key, ttl=3600, failure_cooldown=300, clock=time.monotonic):
+        self.genai = genai
+        self.api_key = api_key
+        self.ttl = ttl
+        self.failure_cooldown = failure_cooldown
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._configured = False
+        self._available = None
+        self._fetched_at = None
+        self._refreshing = False
+        self._failed = {}
+
+    def _configure(self):
+        if not self._configured:
+            self.genai.configure(api_key=self.api_key)
+            self._configured = True
+
+    def refresh(self):
+        """Fetch the model list now. Keeps the previous list if the call fails."""
+        try:
+            with self._lock:
+                self._configure()
+            available = _list_generate_models(self.genai)
+        except Exception as e:
+            logger.warning("Listing Gemini models failed: %s", e)
+            available = None
+        with self._lock:
+            if available is not None:
+                self._available = available
+            elif self._available is None:
+                self._available = []
+            self._fetched_at = self.clock()
+            self._refreshing = False
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="gemini-model-refresh", daemon=True).start()
+
+    def available_models(self):
+        """Models supporting generateContent, from cache when possible."""
+        if self._available is None:
+            self.refresh()
+        elif self.clock() - self._fetched_at > self.ttl:
+            self._refresh_in_background()
+        return list(self._available)
+
+    def mark_failed(self, model_name):
+        with self._lock:
+            self._failed[model_name] = self.clock()
+
+    def mark_ok(self, model_name):
+        with self._lock:
+            self._failed.pop(model_name, None)
+
+    def recently_failed(self, model_name):
+        failed_at = self._failed.get(model_name)
+        return failed_at is not None and self.clock() - failed_at < self.failure_cooldown
+
+    def fallback_order(self):
+        """
+        Model names to try, in order. Recently failed models move to the end
+        rather than disappearing, so there is always something to try.
+        """
+        available = self.available_models()
+        names = list(DEFAULT_MODELS)
+        if available and available[0] not in names:
+            names.insert(0, available[0])
+        healthy = [n for n in names if not self.recently_failed(n)]
+        return healthy + [n for n in names if n not in healthy]
+
+    def configure(self):
+        """Configure the client once per process."""
+        with self._lock:
+            self._configure()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry(genai, api_key):
+    """The shared registry; rebuilt if the API key changes."""
+    global _registry
+    with _registry_lock:
+        if _registry is None or _registry.api_key != api_key:
+            _registry = ModelRegistry(
+                genai,
+                api_key,
+                ttl=getattr(settings, "GEMINI_MODELS_TTL", 3600),
+                failure_cooldown=getattr(settings, "GEMINI_MODEL_FAILURE_COOLDOWN", 300),
+            )
+        return _registry
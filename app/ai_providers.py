@@ -0,0 +1,178 @@
+"""
+Text-generation providers for the resume analysis.
+
+``AI_ANALYSIS_PROVIDER`` is the dotted path of the provider class:
+
+- ``app.ai_providers.GeminiProvider``: Google Gemini (the default),
+- ``app.ai_providers.FakeProvider``: deterministic local output, streamed in
+  small chunks, for offline development and load tests.
+
+A provider lists the models to try (in fallback order), generates text and
+can stream it. Hedging and caching (app/ai_analysis.py) work the same for
+every provider.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from . import lazy_libs
+from .ai_models import get_model_registry
+
+
+class AnalysisProvider:
+    name = "base"
+    label = "AI"
+
+    def configuration_error(self):
+        """A message explaining why the provider can't run, or None."""
+        return None
+
+    def models(self):
+        """Model names to try, most preferred first."""
+        raise NotImplementedError
+
+    def generate(self, model_name, prompt, timeout):
+        """Return the full response text."""
+        raise NotImplementedError
+
+    def stream(self, model_name, prompt, timeout):
+        """Yield the response text in chunks as it is generated."""
+        yield self.generate(model_name, prompt, timeout)
+
+    def mark_ok(self, model_name):
+        pass
+
+    def mark_failed(self, model_name):
+        pass
+
+
+class GeminiProvider(AnalysisProvider):
+    name = "gemini"
+    label = "Gemini"
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or getattr(settings, "GOOGLE_AI_API_KEY", None)
+
+    def configuration_error(self):
+        if lazy_libs.genai() is None:
+            return "Google Generative AI library not installed. Run: pip install google-generativeai"
+        if not self.api_key or self.api_key == "YOUR_GOOGLE_AI_API_KEY_HERE":
+            return "Google AI API key not configured. Please set GOOGLE_AI_API_KEY in settings.py"
+        return None
+
+    @property
+    def registry(self):
+        registry = get_model_registry(lazy_libs.genai(), self.api_key)
+        registry.configure()
+        return registry
+
+    def models(self):
+        return self.registry.fallback_order()
+
+    def generate(self, model_name, prompt, timeout):
+        model = lazy_libs.genai().GenerativeModel(model_name)
+        response = model.generate_content(prompt, request_options={"timeout": timeout})
+        return response.text if hasattr(response, "text") else ""
+
+    def stream(self, model_name, prompt, timeout):
+        model = lazy_libs.genai().GenerativeModel(model_name)
+        response = model.generate_content(prompt, stream=True, request_options={"timeout": timeout})
+        for chunk in response:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+    def mark_ok(self, model_name):
+        self.registry.mark_ok(model_name)
+
+    def mark_failed(self, model_name):
+        self.registry.mark_failed(model_name)
+
+
+class FakeProvider(AnalysisProvider):
+    """
+    Offline stand-in for Gemini. The same prompt always produces the same
+    analysis; ``AI_FAKE_PROVIDER_CHUNK_DELAY`` paces the stream.
+    """
+    name = "fake"
+    label = "fake"
+    CHUNK_SIZE = 48
+
+    COMPANIES = [
+        ("Infosys", "Pune"), ("TCS", "Mumbai"), ("Wipro", "Bengaluru"),
+        ("Persistent Systems", "Pune"), ("Thoughtworks", "Pune"),
+        ("Zoho", "Chennai"), ("Freshworks", "Chennai"), ("Razorpay", "Bengaluru"),
+        ("Atlassian", "Bengaluru"), ("Microsoft", "Hyderabad"), ("Google", "Hyderabad"),
+        ("Amazon", "Bengaluru"),
+    ]
+    TOPICS = ["Data structures", "System design", "SQL", "Django", "REST APIs", "Testing", "Git", "Cloud basics"]
+
+    def models(self):
+        return ["fake-analysis"]
+
+    def analysis_for(self, prompt):
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+        companies = rng.sample(self.COMPANIES, 10)
+        return {
+            "top_companies": [
+                {
+                    "name": name,
+                    "location": city,
+                    "match_reason": f"Your projects line up with {name}'s engineering teams.",
+                    "hiring_process": "1. Online Application 2. Online Test 3. Technical Interview 4. HR Round",
+                    "study_resources": rng.sample(self.TOPICS, 3),
+                }
+                for name, city in companies
+            ],
+            "study_plan": {
+                "overview": "Strengthen fundamentals first, then build two portfolio projects.",
+                "timeline": f"{rng.choice([3, 4, 6])} months",
+                "weekly_schedule": [
+                    {"day": day, "topics": rng.sample(self.TOPICS, 2), "hours": rng.choice([1, 2, 3]), "activities": "Practice problems and notes"}
+                    for day in ["Monday", "Wednesday", "Friday"]
+                ],
+                "skill_gaps": rng.sample(self.TOPICS, 3),
+                "recommended_courses": [
+                    {"name": "Algorithms Specialization", "platform": "Coursera", "duration": "8 weeks", "description": "Covers interview fundamentals."},
+                ],
+                "practice_projects": [
+                    {"title": "Job tracker", "description": "Track applications with reminders.", "technologies": ["Django", "SQLite"], "difficulty": "Intermediate"},
+                ],
+                "certifications": [
+                    {"name": "AWS Cloud Practitioner", "issuer": "Amazon Web Services", "importance": "Common baseline for cloud roles."},
+                ],
+            },
+        }
+
+    def generate(self, model_name, prompt, timeout):
+        return "".join(self.stream(model_name, prompt, timeout))
+
+    def stream(self, model_name, prompt, timeout):
+        text = "```json\n" + json.dumps(self.analysis_for(prompt), indent=2) + "\n```"
+        delay = getattr(settings, "AI_FAKE_PROVIDER_CHUNK_DELAY", 0.05)
+        deadline = time.monotonic() + timeout
+        for start in range(0, len(text), self.CHUNK_SIZE):
+            if delay:
+                if time.monotonic() + delay > deadline:
+                    raise TimeoutError("Fake provider timed out")
+                time.sleep(delay)
+            yield text[start:start + self.CHUNK_SIZE]
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """The configured provider instance (``AI_ANALYSIS_PROVIDER``)."""
+    global _provider
+    path = getattr(settings, "AI_ANALYSIS_PROVIDER", "app.ai_providers.GeminiProvider")
+    with _provider_lock:
+        if _provider is None or _provider[0] != path:
+            _provider = (path, import_string(path)())
+        return _provider[1]
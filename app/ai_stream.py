@@ -0,0 +1,95 @@
+"""
+Partial model output of a running analysis job, shared through the
+``AI_STREAM_CACHE_ALIAS`` cache so the SSE endpoint can tail it.
+
+The job thread publishes the text received so far; readers get
+``(generation, text)``. The generation changes when the stream restarts
+(the model that was streaming failed and another took over), so readers
+know to discard what they parsed.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Cache writes are throttled to this interval while text is arriving
+PUBLISH_INTERVAL = 0.1
+
+
+def _cache():
+    return caches[getattr(settings, "AI_STREAM_CACHE_ALIAS", "default")]
+
+
+class JobStream:
+    def __init__(self, job_id, timeout=600):
+        self.key = f"ai-stream:{job_id}"
+        self.timeout = timeout
+        self._generation = 0
+        self._last_publish = 0.0
+
+    def publish(self, text, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_publish < PUBLISH_INTERVAL:
+            return
+        self._last_publish = now
+        _cache().set(self.key, (self._generation, text), self.timeout)
+
+    def reset(self):
+        self._generation += 1
+        self._last_publish = 0.0
+        _cache().set(self.key, (self._generation, ""), self.timeout)
+
+    def read(self):
+        return _cache().get(self.key, (0, ""))
+
+    async def aread(self):
+        return await _cache().aget(self.key, (0, ""))
+
+    def clear(self):
+        _cache().delete(self.key)
+
+    async def aclear(self):
+        await _cache().adelete(self.key)
+
+
+class StreamClaim:
+    """
+    With hedged calls several models may be streaming at once; the first
+    one to produce text owns the job stream until it fails, or until another
+    model's complete answer wins (``finish``).
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._owner = None
+        self._lock = threading.Lock()
+
+    def publish(self, model_name, text, force=False):
+        with self._lock:
+            if self._owner is None:
+                self._owner = model_name
+            elif self._owner != model_name:
+                return
+            self.stream.publish(text, force=force)
+
+    def finish(self, model_name, text):
+        """Publish the winning answer, taking the stream over if another model owned it."""
+        with self._lock:
+            if self._owner != model_name:
+                if self._owner is not None:
+                    self.stream.reset()
+                self._owner = model_name
+            self.stream.publish(text, force=True)
+
+    def release(self, model_name):
+        with self._lock:
+            if self._owner == model_name:
+                self._owner = None
+                self.stream.reset()
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Event; ``data`` is sent as a single JSON line."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,248 @@
+"""
+ATS scoring engine.
+
+The section/keyword dictionaries live in ``app/data/ats_dictionaries.json``
+(or the file named by ``settings.ATS_DICTIONARIES_PATH``) and are compiled
+once into lookup tables:
+
+- single-word terms go into a set that is intersected with the resume's
+  tokens,
+- multi-word terms ("rest api", "machine learning") are matched as whole
+  phrases against the space-joined token stream,
+- terms with symbols ("c++", "c#") go into one combined regex with
+  word-boundary lookarounds.
+
+A resume is tokenized exactly once; the token list gives both the word count
+and the term hits, so adding keywords does not add another scan of the text.
+ASCII text is tokenized with ``str.translate`` + ``split`` instead of a regex,
+which is where most of the time used to go.
+Matching is on whole words, so "git" no longer matches inside "digital".
+"""
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_DICTIONARIES_PATH = Path(__file__).resolve().parent / "data" / "ats_dictionaries.json"
+
+_WORD_RE = re.compile(r"\w+")
+# Every ASCII character that is not a regex word character becomes a space, so
+# ``text.translate(_ASCII_SEPARATORS).split()`` tokenizes ASCII text exactly
+# like ``_WORD_RE.findall(text)`` without the per-match overhead.
+_ASCII_SEPARATORS = str.maketrans({
+    c: " " for c in map(chr, range(128)) if not _WORD_RE.match(c)
+})
+# Non-ASCII punctuation that PDF text extraction commonly produces (bullets,
+# dashes, smart quotes, nbsp). Replacing these keeps most resumes on the
+# ASCII fast path.
+_COMMON_SEPARATORS = "\u2022\u2013\u2014\u2018\u2019\u201c\u201d\u2026\u00b7\u25aa\u25cf\u00a0\uf0b7"
+# Characters a term may contain and still be matched through the token stream
+# ("e-commerce" and "ci/cd" tokenize the same way as "e commerce" / "ci cd").
+_SYMBOL_RE = re.compile(r"[^\w\s\-/]")
+
+
+@dataclass(frozen=True)
+class CategoryScore:
+    name: str
+    weight: float
+    matched: tuple
+    total: int
+    points: float
+
+
+@dataclass(frozen=True)
+class ATSResult:
+    score: int
+    word_count: int
+    length_points: float
+    categories: dict = field(default_factory=dict)
+
+    def breakdown(self):
+        """Plain-dict form of the per-category scores (JSON serializable)."""
+        data = {
+            name: {
+                "points": round(cat.points, 2),
+                "weight": cat.weight,
+                "matched": list(cat.matched),
+                "total": cat.total,
+            }
+            for name, cat in self.categories.items()
+        }
+        data["length"] = {"points": self.length_points, "word_count": self.word_count}
+        return data
+
+
+class ATSScorer:
+    """
+    Compiled ATS scorer. Build it with ``from_dict``/``from_file`` and reuse
+    it; compiling is the expensive part, scoring a text is a single pass.
+    """
+
+    def __init__(self, categories, length_weight, length_bands):
+        self.categories = []
+        self.length_weight = float(length_weight)
+        self.length_bands = [
+            (int(band["min"]), int(band["max"]), float(band["points"]))
+            for band in length_bands
+        ]
+
+        single_words = set()
+        phrases = set()
+        symbol_terms = set()
+        for category in categories:
+            terms = []
+            for raw in category["terms"]:
+                term = " ".join(raw.lower().split())
+                if not term:
+                    continue
+                if _SYMBOL_RE.search(term):
+                    symbol_terms.add(term)
+                    key = term
+                else:
+                    key = " ".join(_WORD_RE.findall(term))
+                    if " " in key:
+                        phrases.add(key)
+                    else:
+                        single_words.add(key)
+                terms.append((raw, key))
+            self.categories.append({
+                "name": category["name"],
+                "weight": float(category["weight"]),
+                "terms": terms,
+                "keys": frozenset(key for _, key in terms),
+            })
+
+        self._single_words = frozenset(single_words)
+        # Longest first so a phrase can't be shadowed by one of its prefixes.
+        self._phrases = tuple(sorted(phrases, key=len, reverse=True))
+        self._symbol_re = None
+        if symbol_terms:
+            alternatives = "|".join(
+                r"\s+".join(re.escape(part) for part in term.split())
+                for term in sorted(symbol_terms, key=len, reverse=True)
+            )
+            self._symbol_re = re.compile(r"(?<!\w)(?:%s)(?![\w+#])" % alternatives)
+
+    @classmethod
+    def from_dict(cls, data):
+        length = data.get("length", {})
+        return cls(
+            categories=data["categories"],
+            length_weight=length.get("weight", 0),
+            length_bands=length.get("bands", []),
+        )
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
+
+    def score(self, text: str) -> ATSResult:
+        """Score a single resume text. Returns an ``ATSResult``."""
+        if not text:
+            return self._empty_result()
+
+        text_lower = text.lower()
+        tokens = _tokenize(text_lower)
+
+        hits = set(self._single_words.intersection(tokens))
+        if self._phrases:
+            joined = " %s " % " ".join(tokens)
+            for phrase in self._phrases:
+                if " %s " % phrase in joined:
+                    hits.add(phrase)
+        if self._symbol_re is not None:
+            for match in self._symbol_re.findall(text_lower):
+                hits.add(" ".join(match.split()))
+
+        return self._build_result(hits, len(tokens))
+
+    def score_many(self, texts):
+        """Score an iterable of texts. Returns a list of ``ATSResult``."""
+        score = self.score
+        return [score(text) for text in texts]
+
+    def _length_points(self, word_count):
+        for low, high, points in self.length_bands:
+            if low <= word_count <= high:
+                return min(points, self.length_weight)
+        return 0.0
+
+    def _build_result(self, hits, word_count):
+        total = 0.0
+        categories = {}
+        for category in self.categories:
+            terms = category["terms"]
+            matched = tuple(raw for raw, key in terms if key in hits)
+            points = 0.0
+            if terms:
+                points = min(category["weight"] * len(matched) / len(terms), category["weight"])
+            total += points
+            categories[category["name"]] = CategoryScore(
+                name=category["name"],
+                weight=category["weight"],
+                matched=matched,
+                total=len(terms),
+                points=points,
+            )
+
+        length_points = self._length_points(word_count)
+        total += length_points
+        return ATSResult(
+            score=int(max(0, min(100, round(total)))),
+            word_count=word_count,
+            length_points=length_points,
+            categories=categories,
+        )
+
+    def _empty_result(self):
+        return ATSResult(score=0, word_count=0, length_points=0.0, categories={
+            category["name"]: CategoryScore(
+                name=category["name"],
+                weight=category["weight"],
+                matched=(),
+                total=len(category["terms"]),
+                points=0.0,
+            )
+            for category in self.categories
+        })
+
+
+def _tokenize(text_lower):
+    """Same tokens as ``re.findall(r"\\w+", text_lower)``."""
+    if not text_lower.isascii():
+        for ch in _COMMON_SEPARATORS:
+            if ch in text_lower:
+                text_lower = text_lower.replace(ch, " ")
+        if not text_lower.isascii():
+            return _WORD_RE.findall(text_lower)
+    return text_lower.translate(_ASCII_SEPARATORS).split()
+
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+
+def get_scorer() -> ATSScorer:
+    """Process-wide scorer compiled from the configured dictionaries."""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = ATSScorer.from_file(_dictionaries_path())
+    return _scorer
+
+
+def _dictionaries_path():
+    from django.conf import settings
+
+    return getattr(settings, "ATS_DICTIONARIES_PATH", None) or DEFAULT_DICTIONARIES_PATH
+
+
+def score_text(text: str) -> ATSResult:
+    return get_scorer().score(text)
+
+
+def score_many(texts):
+    return get_scorer().score_many(texts)
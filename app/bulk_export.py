@@ -0,0 +1,121 @@
+"""
+Streamed ZIP export of a user's resumes in every template.
+
+Cached PDFs are written straight away; the rest are rendered on the render
+pool (app/render_pool.py) and added to the archive in completion order.
+The ZIP is produced incrementally into a small buffer that is drained after
+every chunk, so the response starts immediately and the archive is never
+held in memory as a whole.
+"""
+import zipfile
+from concurrent.futures import as_completed
+
+from django.utils.text import slugify
+
+from .pdf_cache import get_pdf_cache
+from .pdf_render import render_resume_pdf, resume_pdf_key
+from .render_pool import get_render_pool, render_to_cache
+
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class _StreamBuffer:
+    """
+    Write-only file object for ZipFile. It has tell() but no seek(), which
+    makes ZipFile write data descriptors instead of seeking back.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _entry_name(resume, template_slug):
+    folder = f"{slugify(resume.full_name) or 'resume'}-{resume.pk}"
+    return f"{folder}/{template_slug}.pdf"
+
+
+def stream_resumes_zip(resumes, template_slugs):
+    """Yield the bytes of a ZIP holding every resume in every template."""
+    chunks = _generate_zip(resumes, template_slugs)
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield chunk
+    finally:
+        chunks.close()
+
+
+def _generate_zip(resumes, template_slugs):
+    resumes = list(resumes)
+    by_id = {resume.pk: resume for resume in resumes}
+    buffer = _StreamBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+    failures = []
+
+    def add_file(name, fh):
+        with fh, archive.open(name, mode="w") as entry:
+            while True:
+                chunk = fh.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                entry.write(chunk)
+                yield buffer.drain()
+        yield buffer.drain()
+
+    pdf_cache = get_pdf_cache()
+    pending = []
+    for resume in resumes:
+        for template_slug in template_slugs:
+            cached = pdf_cache.open(resume_pdf_key(resume, template_slug))
+            if cached is not None:
+                yield from add_file(_entry_name(resume, template_slug), cached)
+            else:
+                pending.append((resume.pk, template_slug))
+
+    pool = get_render_pool()
+    futures = {pool.submit(render_to_cache, *job): job for job in pending}
+    try:
+        for future in as_completed(futures):
+            resume_id, template_slug = futures[future]
+            resume = by_id[resume_id]
+            name = _entry_name(resume, template_slug)
+            try:
+                fh = open(future.result(), "rb")
+            except FileNotFoundError:
+                # Evicted between render and read; render it here instead.
+                try:
+                    archive.writestr(name, render_resume_pdf(resume, template_slug))
+                except Exception as e:
+                    failures.append(f"{name}: {e}")
+                yield buffer.drain()
+                continue
+            except Exception as e:
+                failures.append(f"{name}: {e}")
+                continue
+            yield from add_file(name, fh)
+
+        if failures:
+            archive.writestr("errors.txt", "\n".join(failures) + "\n")
+        archive.close()
+        yield buffer.drain()
+    finally:
+        # Client went away: don't leave queued renders behind.
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,72 @@
+"""
+Conditional GET for rendered pages: a repeat request whose If-None-Match (or
+If-Modified-Since) still matches gets a 304 before anything is rendered.
+
+Validators are computed from what the output depends on, never from the
+output itself:
+
+- resume preview and PDF: the resume's ``updated_at`` plus the template
+  version (source hash, and RENDER_CONTEXT_VERSION / PDF_CSS_HASH), the
+  same inputs the preview and PDF caches are keyed on. Last-Modified is the
+  later of ``updated_at`` and the template file's mtime.
+- template gallery: the ResumeTemplate rows, the page templates and the
+  user shown in the navigation bar. The rows carry no timestamp, so this
+  page has an ETag only.
+
+Responses are ``private, no-cache``: browsers keep them but revalidate each
+time, which is a cheap 304 until the resume or a template changes.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .models import ResumeTemplate
+from .pdf_render import resume_pdf_key, template_mtime, template_source_hash
+from .preview_cache import get_preview_cache
+
+GALLERY_TEMPLATES = ("templates.html", "base.html")
+
+
+def strong_etag(*parts):
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return '"%s"' % digest[:32]
+
+
+def resume_validators(resume, template_slug, kind):
+    """``(etag, last_modified)`` of a resume rendered as ``"preview"`` or ``"pdf"``."""
+    if kind == "pdf":
+        etag = strong_etag("pdf", resume_pdf_key(resume, template_slug))
+    else:
+        etag = strong_etag("preview", resume.pk, *get_preview_cache().version(resume, template_slug))
+    times = [resume.updated_at.timestamp(), template_mtime(f"resume/{template_slug}.html")]
+    return etag, int(max(t for t in times if t is not None))
+
+
+def gallery_etag(user):
+    rows = list(ResumeTemplate.objects.order_by("pk").values_list(
+        "pk", "name", "description", "preview_image", "slug",
+    ))
+    if user.is_authenticated:
+        viewer = (user.pk, user.username, user.first_name, user.email)
+    else:
+        viewer = ()
+    return strong_etag(
+        "gallery", rows, viewer, *(template_source_hash(name) for name in GALLERY_TEMPLATES)
+    )
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def not_modified(request, etag, last_modified=None):
+    """The 304 (or 412) response if the client's copy is current, else None."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
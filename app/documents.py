@@ -0,0 +1,80 @@
+"""
+Content-addressed store for uploaded resume PDFs.
+
+Uploads are hashed (SHA-256 of the raw bytes) during ingestion; if an
+``UploadedDocument`` with that hash exists, its stored text, page count and
+ATS score are reused and the PDF is never parsed again. Rows that hold no
+text or whose extraction ran out of time are not reused: the next upload of
+the same file is parsed again (a busy server or an image-only PDF shouldn't
+stick to the file forever) and the row is updated.
+"""
+from django.db import IntegrityError, transaction
+
+from .ats import score_text
+from .extraction import ExtractionError, ExtractionResult, extract_text
+from .models import UploadedDocument
+
+
+class DocumentError(Exception):
+    """Raised when an uploaded file cannot be read as a PDF."""
+
+
+EXTRACTION_TIMEOUT_MESSAGE = "Reading this PDF took too long. Please try again in a moment, or upload a shorter file."
+
+
+def extract_pdf_text(ingested) -> ExtractionResult:
+    """
+    Extract the PDF's text through the shared extraction pool, within the
+    configured page/time/size budgets (see app/extraction.py).
+    """
+    try:
+        result = extract_text(ingested.source)
+    except ExtractionError as e:
+        raise DocumentError("Error reading PDF file. Please try another file.") from e
+    if result.timed_out and not result.text:
+        raise DocumentError(EXTRACTION_TIMEOUT_MESSAGE)
+    return result
+
+
+def get_or_create_document(ingested, user):
+    """
+    Return ``(document, created)`` for an ingested PDF (app/uploads.py),
+    parsing it only if no document with the same content hash exists yet.
+    """
+    sha256 = ingested.sha256
+
+    document = UploadedDocument.objects.filter(sha256=sha256).first()
+    created = False
+    if document is not None and document.text and not document.timed_out:
+        document.save(update_fields=["last_seen_at"])
+    else:
+        result = extract_pdf_text(ingested)
+        fields = {
+            "size": ingested.size,
+            "page_count": result.page_count,
+            "text": result.text,
+            "truncated": result.truncated,
+            "timed_out": result.timed_out,
+            "ats_score": score_text(result.text).score,
+        }
+        if document is not None:
+            for name, value in fields.items():
+                setattr(document, name, value)
+            document.save(update_fields=[*fields, "last_seen_at"])
+        else:
+            try:
+                with transaction.atomic():
+                    document = UploadedDocument.objects.create(sha256=sha256, **fields)
+                created = True
+            except IntegrityError:
+                # Same file uploaded concurrently; keep the row that won.
+                document = UploadedDocument.objects.get(sha256=sha256)
+
+    if user is not None and user.is_authenticated:
+        document.uploaded_by.add(user)
+    return document, created
+
+
+def get_user_document(user, document_id):
+    """Fetch a stored document the user has uploaded before, or None."""
+    return UploadedDocument.objects.filter(id=document_id, uploaded_by=user).first()
@@ -0,0 +1,287 @@
+"""
+Shared PDF text-extraction service.
+
+pypdf runs in a separate process pool (``settings.PDF_EXTRACT_WORKERS``) so a
+slow or malformed PDF occupies an extraction worker rather than a web worker.
+Every document gets a budget:
+
+- ``PDF_EXTRACT_TIMEOUT``: wall-clock seconds for the whole document,
+  counted from when a worker starts on it (not while it waits in the queue),
+- ``PDF_EXTRACT_MAX_PAGES``: pages read before giving up on the rest,
+- ``PDF_EXTRACT_MAX_CHARS``: characters of text kept.
+
+When a budget runs out the text read so far is returned with
+``truncated=True`` instead of blocking the request. Setting
+``PDF_EXTRACT_WORKERS = 0`` runs extraction inline (same budgets).
+
+Large uploads are passed by path (see app/uploads.py) rather than pickled
+into the worker.
+"""
+import itertools
+import mmap
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from io import BytesIO
+
+from django.conf import settings
+
+from . import lazy_libs
+
+# Extra time the web process waits on top of the document budget (counted
+# from when a worker starts the document) before it assumes the worker is
+# wedged and recycles the pool.
+HARD_TIMEOUT_GRACE = 2.0
+
+# How often the web process checks whether a queued document has started.
+POLL_INTERVAL = 0.25
+
+# Separates pages in ExtractionResult.text (form feed, as pdftotext does).
+PAGE_BREAK = "\f"
+
+
+class ExtractionError(Exception):
+    """Raised when a PDF cannot be opened at all."""
+
+
+@dataclass(frozen=True)
+class ExtractionResult:
+    text: str
+    page_count: int
+    pages_read: int
+    truncated: bool
+    timed_out: bool = False
+
+
+class _Deadline(BaseException):
+    # BaseException so pypdf's own ``except Exception`` blocks don't swallow it
+    pass
+
+
+def _raise_deadline(signum, frame):
+    raise _Deadline()
+
+
+def _open_source(source):
+    """
+    PDF bytes are wrapped in BytesIO; a file path is memory-mapped so pypdf
+    reads pages from the page cache instead of a private copy of the file.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return BytesIO(source), None
+    with open(source, "rb") as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    return mapped, mapped
+
+
+def _extract(source, max_pages, max_chars, timeout):
+    """Runs inside a pool worker (or inline when the pool is disabled)."""
+    PdfReader = lazy_libs.pypdf().PdfReader
+
+    deadline = time.monotonic() + timeout
+    # SIGALRM interrupts a single page that would otherwise run past the
+    # budget; only possible in a process's main thread (always true for pool
+    # workers, usually false for inline extraction under a threaded server).
+    use_alarm = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_deadline)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    mapped = None
+    parts = []
+    chars = 0
+    pages_read = 0
+    page_count = 0
+    truncated = False
+    timed_out = False
+    try:
+        try:
+            stream, mapped = _open_source(source)
+            reader = PdfReader(stream)
+            page_count = len(reader.pages)
+        except Exception as e:
+            raise ExtractionError(str(e)) from None
+
+        for index in range(page_count):
+            if index >= max_pages:
+                truncated = True
+                break
+            if time.monotonic() >= deadline:
+                truncated = timed_out = True
+                break
+            try:
+                page_text = reader.pages[index].extract_text()
+            except Exception:
+                # Continue with other pages if one fails
+                continue
+            finally:
+                pages_read += 1
+            if not page_text:
+                continue
+            if chars + len(page_text) > max_chars:
+                parts.append(page_text[:max_chars - chars])
+                truncated = True
+                break
+            parts.append(page_text)
+            chars += len(page_text)
+    except _Deadline:
+        truncated = timed_out = True
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        if mapped is not None:
+            mapped.close()
+
+    return ExtractionResult(
+        text=PAGE_BREAK.join(parts).strip(),
+        page_count=page_count,
+        pages_read=pages_read,
+        truncated=truncated,
+        timed_out=timed_out,
+    )
+
+
+_started = None  # in pool workers: queue for task start reports
+
+
+def _init_worker(started):
+    global _started
+    _started = started
+
+
+def _extract_task(task_id, source, max_pages, max_chars, timeout):
+    """Pool entry point: report the start, then extract (the budget starts now too)."""
+    _started.put(task_id)
+    return _extract(source, max_pages, max_chars, timeout)
+
+
+class _ExtractionPool:
+    """
+    A process pool plus the times its tasks actually started running, so the
+    hard timeout doesn't count time spent waiting behind other documents.
+    """
+
+    def __init__(self, workers):
+        # spawn, not fork: the web process has threads and open DB
+        # connections that must not be duplicated into workers.
+        context = multiprocessing.get_context("spawn")
+        self._started = context.SimpleQueue()
+        self._start_times = {}
+        self._lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self.recycled = False
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            max_tasks_per_child=getattr(settings, "PDF_EXTRACT_MAX_TASKS_PER_CHILD", 100),
+            initializer=_init_worker,
+            initargs=(self._started,),
+        )
+
+    def submit(self, *args):
+        task_id = next(self._task_ids)
+        return task_id, self.executor.submit(_extract_task, task_id, *args)
+
+    def started_at(self, task_id):
+        """When the task started running in a worker (time.monotonic()), or None while queued."""
+        with self._lock:
+            while not self._started.empty():
+                self._start_times[self._started.get()] = time.monotonic()
+            return self._start_times.get(task_id)
+
+    def forget(self, task_id):
+        with self._lock:
+            self._start_times.pop(task_id, None)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    workers = getattr(settings, "PDF_EXTRACT_WORKERS", 2)
+    if workers <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _ExtractionPool(workers)
+    return _pool
+
+
+def _discard_pool(pool):
+    """
+    Kill a pool whose worker is stuck so the next request gets a fresh one.
+    ProcessPoolExecutor can't lose a single worker without breaking, so the
+    other documents in flight on it are resubmitted (see extract_text).
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.recycled = True
+    for process in list(getattr(pool.executor, "_processes", {}).values()):
+        process.terminate()
+    pool.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_in_pool(pool, source, max_pages, max_chars, timeout):
+    """
+    Wait for one document. The hard limit is measured from when a worker
+    picked the task up; waiting in the queue behind other documents doesn't
+    count, and each of those is bounded by its own budget.
+    """
+    hard_limit = timeout + HARD_TIMEOUT_GRACE
+    task_id, future = pool.submit(source, max_pages, max_chars, timeout)
+    try:
+        while True:
+            try:
+                return future.result(timeout=POLL_INTERVAL)
+            except FutureTimeoutError:
+                started = pool.started_at(task_id)
+                if started is not None and time.monotonic() - started > hard_limit:
+                    _discard_pool(pool)
+                    return ExtractionResult(text="", page_count=0, pages_read=0, truncated=True, timed_out=True)
+    finally:
+        pool.forget(task_id)
+
+
+def extract_text(source) -> ExtractionResult:
+    """
+    Extract text from a PDF, given as bytes or as a path to a file on local
+    disk, within the configured budgets.
+    Raises ExtractionError if the file cannot be opened as a PDF.
+    """
+    max_pages = getattr(settings, "PDF_EXTRACT_MAX_PAGES", 20)
+    max_chars = getattr(settings, "PDF_EXTRACT_MAX_CHARS", 100_000)
+    timeout = getattr(settings, "PDF_EXTRACT_TIMEOUT", 10)
+
+    pool = _get_pool()
+    if pool is None:
+        return _extract(source, max_pages, max_chars, timeout)
+
+    try:
+        return _run_in_pool(pool, source, max_pages, max_chars, timeout)
+    except (BrokenProcessPool, CancelledError) as e:
+        if not pool.recycled:
+            _discard_pool(pool)
+            raise ExtractionError("PDF extraction worker crashed") from e
+    # Another request's stuck document recycled the pool under this one
+    try:
+        return _run_in_pool(_get_pool(), source, max_pages, max_chars, timeout)
+    except (BrokenProcessPool, CancelledError) as e:
+        raise ExtractionError("PDF extraction worker crashed") from e
@@ -0,0 +1,115 @@
+"""
+Incremental JSON parser for model output that arrives in chunks.
+
+Only nesting, strings and separators are tracked; every value found at the
+requested depth is parsed with ``json.loads`` as soon as its closing
+character has arrived. With ``depth=2`` an analysis yields e.g.::
+
+    (("top_companies", 0), {...})
+    (("study_plan", "overview"), "...")
+
+Anything before the first ``{``/``[`` (such as a ```json fence) and anything
+after the document ends is ignored.
+"""
+import json
+
+
+class IncrementalJSONParser:
+    def __init__(self, depth=2):
+        self.depth = depth
+        self.document = None
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        # Frames are [kind, key_or_index, expecting]; kind is "{" or "[",
+        # expecting is "key", "colon" or "value".
+        self._stack = []
+        self._doc_start = None
+        self._value_start = None
+        self._scalar_start = None
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._string_start = None
+
+    def feed(self, chunk):
+        """Add text; returns a list of ``(path, value)`` completed by it."""
+        self._text += chunk
+        text = self._text
+        events = []
+        i = self._pos
+        while i < len(text) and not self.done:
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        frame = self._stack[-1]
+                        frame[1] = json.loads(text[self._string_start:i + 1])
+                        frame[2] = "colon"
+                    else:
+                        self._end_value(i + 1, events)
+                i += 1
+                continue
+
+            if self._doc_start is None:
+                if c not in "{[":
+                    i += 1
+                    continue
+                self._doc_start = i
+
+            if self._scalar_start is not None and (c in ",}]" or c.isspace()):
+                self._scalar_start = None
+                self._end_value(i, events)
+
+            if c == '"':
+                frame = self._stack[-1] if self._stack else None
+                is_key = frame is not None and frame[0] == "{" and frame[2] == "key"
+                if not is_key:
+                    self._begin_value(i)
+                self._in_string = True
+                self._string_is_key = is_key
+                self._string_start = i
+            elif c in "{[":
+                self._begin_value(i)
+                self._stack.append([c, None, "key"] if c == "{" else [c, 0, "value"])
+            elif c in "}]":
+                if not self._stack or self._stack[-1][0] != ("{" if c == "}" else "["):
+                    raise ValueError(f"Unexpected {c!r} at offset {i}")
+                self._stack.pop()
+                self._end_value(i + 1, events)
+            elif c == ":":
+                if not self._stack:
+                    raise ValueError(f"Unexpected ':' at offset {i}")
+                self._stack[-1][2] = "value"
+            elif c == ",":
+                if not self._stack:
+                    raise ValueError(f"Unexpected ',' at offset {i}")
+                frame = self._stack[-1]
+                if frame[0] == "{":
+                    frame[2] = "key"
+                else:
+                    frame[1] += 1
+            elif not c.isspace() and self._scalar_start is None:
+                self._begin_value(i)
+                self._scalar_start = i
+            i += 1
+        self._pos = i
+        return events
+
+    def _begin_value(self, offset):
+        if len(self._stack) == self.depth and self._value_start is None:
+            self._value_start = offset
+
+    def _end_value(self, end, events):
+        if not self._stack:
+            self.document = json.loads(self._text[self._doc_start:end])
+            self.done = True
+        elif len(self._stack) == self.depth and self._value_start is not None:
+            path = tuple(frame[1] for frame in self._stack)
+            events.append((path, json.loads(self._text[self._value_start:end])))
+            self._value_start = None
@@ -0,0 +1,60 @@
+"""
+Accessors for the heavy third-party libraries.
+
+xhtml2pdf (with reportlab), pypdf and google-generativeai (with grpc and
+protobuf) together take over a second to import. Modules in this app must
+not import them at module level; they call these accessors where the
+library is actually used, so management commands, migrations and worker
+boot don't pay for subsystems they never touch. The import happens once,
+on first use.
+
+benchmarks/import_benchmark.py fails if any of HEAVY_MODULES is imported
+while Django starts up and loads the URLconf.
+"""
+import importlib
+import threading
+
+# Top-level packages that must stay out of the boot path
+HEAVY_MODULES = ("xhtml2pdf", "reportlab", "pypdf", "google.generativeai", "grpc", "google.protobuf")
+
+_modules = {}
+_lock = threading.Lock()
+
+
+def _load(name):
+    module = _modules.get(name)
+    if module is None:
+        with _lock:
+            module = _modules.get(name)
+            if module is None:
+                module = _modules[name] = importlib.import_module(name)
+    return module
+
+
+def pisa():
+    """The ``xhtml2pdf.pisa`` module."""
+    return _load("xhtml2pdf.pisa")
+
+
+def xhtml2pdf_reportlab():
+    """``xhtml2pdf.xhtml2pdf_reportlab`` (image handling, see app/pdf_links.py)."""
+    return _load("xhtml2pdf.xhtml2pdf_reportlab")
+
+
+def pypdf():
+    return _load("pypdf")
+
+
+_genai_missing = False
+
+
+def genai():
+    """``google.generativeai``, or None if it isn't installed."""
+    global _genai_missing
+    if _genai_missing:
+        return None
+    try:
+        return _load("google.generativeai")
+    except ImportError:
+        _genai_missing = True
+        return None
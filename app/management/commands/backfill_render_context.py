@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from app.models import Resume
+from app.resume_context import RENDER_CONTEXT_VERSION, compute_render_context
+
+
+class Command(BaseCommand):
+    help = "Compute Resume.render_context for rows saved before it existed or with an older schema version."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Recompute every resume, not just stale ones.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.order_by("id")
+        if not options["all"]:
+            resumes = resumes.filter(~Q(render_context_version=RENDER_CONTEXT_VERSION))
+
+        batch_size = options["batch_size"]
+        batch = []
+        count = 0
+        # bulk_update skips save(), so updated_at (and the PDF cache keys
+        # derived from it) stay as they are.
+        for resume in resumes.iterator(chunk_size=batch_size):
+            resume.render_context = compute_render_context(resume)
+            resume.render_context_version = RENDER_CONTEXT_VERSION
+            batch.append(resume)
+            if len(batch) >= batch_size:
+                Resume.objects.bulk_update(batch, ["render_context", "render_context_version"])
+                count += len(batch)
+                batch = []
+        if batch:
+            Resume.objects.bulk_update(batch, ["render_context", "render_context_version"])
+            count += len(batch)
+        self.stdout.write(f"Updated the render context of {count} resume(s).")
@@ -0,0 +1,100 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from app.models import Resume, StoredPhoto
+from app.photo_refs import rebuild_all_photo_refs
+from app.photo_storage import PHOTO_DIR, get_photo_storage, photo_hash
+from app.preview_cache import get_preview_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete photo files that no resume references any more, after recounting the "
+        "references. With --migrate-legacy, photos uploaded before content-addressed "
+        "storage are first moved into it, so duplicate copies become collectable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted.")
+        parser.add_argument(
+            "--grace-minutes", type=int, default=60,
+            help="Keep unreferenced files younger than this (uploads whose resume isn't saved yet).",
+        )
+        parser.add_argument("--migrate-legacy", action="store_true")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        storage = get_photo_storage()
+
+        if options["migrate_legacy"]:
+            self.migrate_legacy(storage, dry_run)
+
+        referenced = rebuild_all_photo_refs()
+        live_hashes = {photo_hash(name) for name in referenced} - {None}
+
+        cutoff = time.time() - options["grace_minutes"] * 60
+        root = Path(storage.location)
+        photo_root = root / PHOTO_DIR
+        deleted = freed = kept = 0
+        for path in sorted(photo_root.rglob("*")) if photo_root.is_dir() else []:
+            if not path.is_file():
+                continue
+            name = path.relative_to(root).as_posix()
+            # Derived files (<hash>.<variant>.<ext>) live as long as their original
+            if name in referenced or photo_hash(name) in live_hashes:
+                kept += 1
+                continue
+            stat = path.stat()
+            if stat.st_mtime > cutoff:
+                kept += 1
+                continue
+            deleted += 1
+            freed += stat.st_size
+            if dry_run:
+                self.stdout.write(f"would delete {name}")
+                continue
+            path.unlink(missing_ok=True)
+
+        if not dry_run:
+            for directory in sorted((p for p in photo_root.rglob("*") if p.is_dir()), reverse=True):
+                try:
+                    directory.rmdir()  # only succeeds when empty
+                except OSError:
+                    pass
+            gone = [
+                photo.pk for photo in StoredPhoto.objects.filter(ref_count__lte=0)
+                if not storage.exists(photo.name)
+            ]
+            StoredPhoto.objects.filter(pk__in=gone).delete()
+
+        verb = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(
+            f"{verb} {deleted} file(s), {freed / 1024:.0f} KB; kept {kept}; "
+            f"{len(referenced)} photo(s) referenced."
+        )
+
+    def migrate_legacy(self, storage, dry_run):
+        legacy = [
+            name for name in Resume.objects.exclude(photo="").exclude(photo__isnull=True)
+            .values_list("photo", flat=True).distinct()
+            if photo_hash(name) is None
+        ]
+        for name in legacy:
+            if not storage.exists(name):
+                self.stderr.write(f"missing file for {name}, left as is")
+                continue
+            if dry_run:
+                self.stdout.write(f"would migrate {name}")
+                continue
+            with storage.open(name) as fh:
+                new_name = storage.save(name, fh)
+            # update() keeps updated_at, so cached PDFs stay valid (the image
+            # bytes are the same); cached previews hold the old URL though.
+            resume_ids = list(Resume.objects.filter(photo=name).values_list("id", flat=True))
+            Resume.objects.filter(id__in=resume_ids).update(photo=new_name)
+            for resume_id in resume_ids:
+                get_preview_cache().invalidate(resume_id)
+            self.stdout.write(f"migrated {name} -> {new_name}")
+        return len(legacy)
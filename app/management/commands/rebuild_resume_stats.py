@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from app.resume_stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized per-user resume stats (UserResumeStats)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", action="append", default=[], help="Username to rebuild (repeatable); default all.")
+
+    def handle(self, *args, **options):
+        users = User.objects.all()
+        if options["user"]:
+            users = users.filter(username__in=options["user"])
+        count = 0
+        for user_id in users.values_list("id", flat=True).iterator():
+            rebuild_user_stats(user_id)
+            count += 1
+        self.stdout.write(f"Rebuilt resume stats for {count} user(s).")
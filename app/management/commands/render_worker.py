@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.render_pool import create_pool, run_render_job
+from app.render_queue import claim_jobs, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = "Process queued PDF render jobs on a local process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=getattr(settings, "PDF_RENDER_WORKERS", 2),
+            help="Number of render processes.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "PDF_RENDER_POLL_INTERVAL", 1.0),
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        poll_interval = options["poll_interval"]
+        stale_after = getattr(settings, "PDF_RENDER_STALE_AFTER", 300)
+
+        requeued = requeue_stale_jobs(stale_after)
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s).")
+
+        pool = create_pool(workers)
+        running = set()
+        self.stdout.write(f"Render worker started with {workers} process(es).")
+        try:
+            while True:
+                free = workers - len(running)
+                if free > 0:
+                    for job_id in claim_jobs(free):
+                        running.add(pool.submit(run_render_job, job_id))
+
+                if running:
+                    done, running = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            self.stdout.write(f"Job {future.result()} finished.")
+                        except Exception as e:
+                            self.stderr.write(f"Render task failed: {e}")
+                    running = set(running)
+                elif options["once"]:
+                    break
+                else:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pool.shutdown(wait=True)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.warmup import run_warmup
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile all project templates, import the PDF libraries and render one PDF per resume "
+        "template, reporting how long each step took. Web processes do the same at startup "
+        "when WARMUP_ON_STARTUP is set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skip-pdf", action="store_true", help="Don't render the sample PDFs.")
+
+    def handle(self, *args, **options):
+        try:
+            timings = run_warmup(pdf=not options["skip_pdf"])
+        except Exception as e:
+            raise CommandError(f"Warm-up failed: {e}") from e
+        for step, seconds in timings.items():
+            self.stdout.write(f"{step:<10} {seconds * 1000:8.1f} ms")
+        self.stdout.write("Warm-up complete.")
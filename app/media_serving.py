@@ -0,0 +1,131 @@
+"""
+Serving uploaded media (resume photos) to their owners.
+
+``MEDIA_ACCEL`` picks how the bytes get to the client:
+
+- ``"x-accel-redirect"`` (nginx) or ``"x-sendfile"`` (Apache, lighttpd):
+  Django only checks access and returns a header; the front server sends
+  the file from ``MEDIA_ACCEL_PREFIX`` + path (an internal location mapped
+  to MEDIA_ROOT) and handles Range itself.
+- ``None``: the file is streamed by Django, with single-range Range
+  support, ETag/Last-Modified revalidation and cache headers.
+
+Content-addressed photos never change under the same name, so they are
+cacheable for a year (``immutable``); anything else must be revalidated.
+Responses are ``private`` because access is per user.
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .photo_storage import PHOTO_DIR, photo_hash
+
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def can_view_media(user, name):
+    """Staff see everything; others only photos of their own resumes."""
+    from .models import Resume
+
+    if not user.is_authenticated or not name.startswith(PHOTO_DIR + "/"):
+        return False
+    if user.is_staff:
+        return True
+    resumes = Resume.objects.filter(user=user)
+    sha256 = photo_hash(name)
+    if sha256 is None:
+        return resumes.filter(photo=name).exists()
+    # The original or any of its derivatives (<hash>.<variant>.jpg)
+    return resumes.filter(photo__startswith=name[:name.index(sha256) + len(sha256)] + ".").exists()
+
+
+def media_etag(name, stat):
+    if photo_hash(name) is not None:
+        return '"%s"' % os.path.basename(name)
+    return '"%x-%x"' % (stat.st_mtime_ns, stat.st_size)
+
+
+def _byte_range(header, size):
+    """(start, end) inclusive for a single-range header; None to send everything, False if unsatisfiable."""
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None  # malformed or multiple ranges: serve the whole file
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def media_response(request, name, path):
+    stat = os.stat(path)
+    etag = media_etag(name, stat)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if photo_hash(name) else REVALIDATE_CACHE_CONTROL,
+    }
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        return not_modified
+
+    accel = getattr(settings, "MEDIA_ACCEL", None)
+    if accel:
+        response = HttpResponse(content_type=content_type)
+        if accel == "x-accel-redirect":
+            response["X-Accel-Redirect"] = getattr(settings, "MEDIA_ACCEL_PREFIX", "/protected-media/") + name
+        else:
+            response["X-Sendfile"] = path
+    else:
+        byte_range = None
+        range_header = request.META.get("HTTP_RANGE")
+        if range_header and request.META.get("HTTP_IF_RANGE", etag) == etag:
+            byte_range = _byte_range(range_header, stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+        start, end = byte_range or (0, stat.st_size - 1)
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(path, start, length),
+            content_type=content_type,
+            status=206 if byte_range else 200,
+        )
+        response["Content-Length"] = str(length)
+        response["Accept-Ranges"] = "bytes"
+        if byte_range:
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+
+    for header, value in headers.items():
+        response[header] = value
+    return response
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-16 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_uploadeddocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadeddocument',
+            name='truncated',
+            field=models.BooleanField(default=False),
+        ),
+    ]
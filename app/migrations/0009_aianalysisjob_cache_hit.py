@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_aianalysisjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aianalysisjob',
+            name='cache_hit',
+            field=models.BooleanField(default=False),
+        ),
+    ]
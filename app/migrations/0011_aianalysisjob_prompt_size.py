@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_analysisresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aianalysisjob',
+            name='input_chars',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='aianalysisjob',
+            name='prompt_chars',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
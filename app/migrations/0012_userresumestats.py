@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0011_aianalysisjob_prompt_size'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserResumeStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resume_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('resume_count', models.PositiveIntegerField(default=0)),
+                ('analyzed_count', models.PositiveIntegerField(default=0)),
+                ('ats_score_sum', models.BigIntegerField(default=0)),
+                ('last_updated', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_userresumestats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='app_resume_user_id_389417_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_resume_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='render_context',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='render_context_version',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
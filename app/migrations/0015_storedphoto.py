@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:22
+
+import app.photo_storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0014_resume_render_context'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredPhoto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='resume',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=app.photo_storage.get_photo_storage, upload_to='photos/'),
+        ),
+    ]
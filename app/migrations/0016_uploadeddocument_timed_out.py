@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0015_storedphoto'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadeddocument',
+            name='timed_out',
+            field=models.BooleanField(default=False),
+        ),
+    ]
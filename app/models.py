@@ -1,9 +1,15 @@
 
 
 # Create your models here.
+import json
+import zlib
+
 from django.db import models
 from django.contrib.auth.models import User
 
+from .photo_storage import get_photo_storage
+from .resume_context import RENDER_CONTEXT_VERSION, compute_render_context
+
 class Resume(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
@@ -34,7 +40,8 @@ class Resume(models.Model):
     email = models.EmailField()
     mobile = models.CharField(max_length=15)
     linkedin = models.URLField(blank=True)
-    photo = models.ImageField(upload_to="photos/", blank=True, null=True)
+    # Stored once per distinct image, see app/photo_storage.py
+    photo = models.ImageField(upload_to="photos/", storage=get_photo_storage, blank=True, null=True)
 
     career_objective = models.TextField()
 
@@ -56,8 +63,207 @@ class Resume(models.Model):
     ats_score = models.IntegerField(default=0)
     analyzed = models.BooleanField(default=False)
 
+    # Parsed template context (app/resume_context.py), refreshed on save
+    render_context = models.JSONField(default=dict, blank=True, editable=False)
+    render_context_version = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Keyset pagination of a user's resumes (app/resume_listing.py)
+        indexes = [models.Index(fields=["user", "-created_at", "-id"])]
+
+    def __str__(self):
+        return self.full_name
+
+    def save(self, *args, **kwargs):
+        self.render_context = compute_render_context(self)
+        self.render_context_version = RENDER_CONTEXT_VERSION
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "render_context", "render_context_version"}
+        super().save(*args, **kwargs)
+
+
+class UploadedDocument(models.Model):
+    """
+    A resume PDF uploaded for ATS scoring / AI analysis, keyed by the SHA-256
+    of its bytes so a repeat upload of the same file is a lookup, not a parse.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveIntegerField(default=0)
+    page_count = models.PositiveIntegerField(default=0)
+    text = models.TextField(blank=True)
+    # Extraction stopped early (page, size or time budget, see app/extraction.py)
+    truncated = models.BooleanField(default=False)
+    # The time budget ran out; the row is re-extracted on the next upload
+    timed_out = models.BooleanField(default=False)
+    ats_score = models.IntegerField(default=0)
+    uploaded_by = models.ManyToManyField(User, related_name="uploaded_documents", blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.sha256[:12]
+
+
+class PDFRenderJob(models.Model):
+    """
+    A queued resume PDF render, processed by ``manage.py render_worker``.
+    The finished PDF lives in the PDF artifact cache under ``cache_key``.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name="render_jobs")
+    template_slug = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)
+    cache_key = models.CharField(max_length=64, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.resume_id}/{self.template_slug} ({self.status})"
+
+
+class AnalysisResult(models.Model):
+    """
+    A finished AI career analysis. The JSON is stored zlib-compressed; the
+    session only keeps the id of the latest one.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="analysis_results")
+    resume = models.ForeignKey(Resume, on_delete=models.SET_NULL, null=True, blank=True, related_name="analysis_results")
+    document = models.ForeignKey(UploadedDocument, on_delete=models.SET_NULL, null=True, blank=True)
+    model_name = models.CharField(max_length=100, blank=True)
+    payload = models.BinaryField()
+    company_count = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "-created_at"])]
+
+    def __str__(self):
+        return f"Analysis {self.pk} for {self.user}"
+
+    @property
+    def data(self):
+        return json.loads(zlib.decompress(bytes(self.payload)))
+
+    @data.setter
+    def data(self, value):
+        self.payload = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 6)
+        companies = value.get("top_companies") if isinstance(value, dict) else None
+        self.company_count = len(companies) if isinstance(companies, list) else 0
+
+
+class AIAnalysisJob(models.Model):
+    """
+    A Gemini resume analysis running in the background (app/ai_analysis.py).
+    The dashboard polls its status instead of holding the request open.
+    """
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ai_analysis_jobs")
+    document = models.ForeignKey(UploadedDocument, on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    model_name = models.CharField(max_length=100, blank=True)
+    cache_hit = models.BooleanField(default=False)
+    # Resume text size before/after compaction (app/text_compaction.py)
+    input_chars = models.PositiveIntegerField(null=True, blank=True)
+    prompt_chars = models.PositiveIntegerField(null=True, blank=True)
+    analysis = models.ForeignKey(AnalysisResult, on_delete=models.SET_NULL, null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"AI analysis {self.pk} ({self.status})"
+
+    @property
+    def queued_seconds(self):
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.created_at).total_seconds()
+
+    @property
+    def prompt_reduction(self):
+        """Fraction of the resume text removed by compaction."""
+        if not self.input_chars or self.prompt_chars is None:
+            return None
+        return 1 - self.prompt_chars / self.input_chars
+
+    @property
+    def run_seconds(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+class UserResumeStats(models.Model):
+    """
+    Per-user resume counters for the dashboard, kept current by the Resume
+    save/delete signals in app/signals.py (see app/resume_stats.py).
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="resume_stats")
+    resume_count = models.PositiveIntegerField(default=0)
+    analyzed_count = models.PositiveIntegerField(default=0)
+    ats_score_sum = models.BigIntegerField(default=0)
+    last_updated = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Resume stats for {self.user}"
+
+    @property
+    def avg_ats(self):
+        return self.ats_score_sum / self.resume_count if self.resume_count else 0
+
+
+class StoredPhoto(models.Model):
+    """
+    A content-addressed photo file (app/photo_storage.py) and how many
+    resumes use it, kept current by the Resume signals. Files nothing
+    references are deleted by ``manage.py gc_photos``.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.full_name
\ No newline at end of file
+        return f"{self.name} ({self.ref_count} refs)"
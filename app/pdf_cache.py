@@ -0,0 +1,153 @@
+"""
+On-disk cache of rendered resume PDFs.
+
+Files are content-addressed by ``pdf_render.resume_pdf_key`` and stored as
+``<PDF_CACHE_DIR>/<key[:2]>/<key>.pdf``. A hit bumps the file's mtime; when
+the directory grows past ``PDF_CACHE_MAX_BYTES`` the least recently used
+files are removed, down to ``EVICT_TO`` of the cap.
+
+Writes don't walk the directory: each process keeps a running estimate of
+its size, measured by a full scan at the first write, whenever the estimate
+crosses the cap, and every ``RESCAN_INTERVAL`` seconds (other processes
+write to the same directory).
+"""
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+
+# Eviction stops at this fraction of max_bytes, so the next writes don't rescan
+EVICT_TO = 0.9
+RESCAN_INTERVAL = 300  # seconds
+
+
+class PDFArtifactCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "scans": 0}
+        self._size_estimate = None
+        self._scanned_at = 0.0
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        return counters
+
+    def exists(self, key):
+        return self._path(key).is_file()
+
+    def open(self, key):
+        """Return an open binary file for a cached PDF, or None on a miss."""
+        path = self._path(key)
+        try:
+            fh = open(path, "rb")
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count("hits")
+        return fh
+
+    def put(self, key, data: bytes):
+        """Store a rendered PDF atomically and evict old entries if needed."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._count("writes")
+        with self._lock:
+            if self._size_estimate is not None:
+                self._size_estimate += len(data) - replaced
+            scan = (
+                self._size_estimate is None
+                or self._size_estimate > self.max_bytes
+                or time.monotonic() - self._scanned_at > RESCAN_INTERVAL
+            )
+        if scan:
+            self.evict()
+        return path
+
+    def evict(self):
+        """
+        Scan the cache directory; if it is over max_bytes, delete least
+        recently used PDFs until it is under ``EVICT_TO`` of it.
+        """
+        self._count("scans")
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".pdf"):
+                    continue
+                full = os.path.join(root, name)
+                try:
+                    st = os.stat(full)
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, full))
+                total += st.st_size
+
+        removed = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TO
+            for _, size, full in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(full)
+                except FileNotFoundError:
+                    continue
+                total -= size
+                removed += 1
+        with self._lock:
+            self._size_estimate = total
+            self._scanned_at = time.monotonic()
+            self._counters["evictions"] += removed
+        return removed
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_pdf_cache() -> PDFArtifactCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PDFArtifactCache(
+                    directory=getattr(settings, "PDF_CACHE_DIR", Path(settings.BASE_DIR) / "var" / "pdf_cache"),
+                    max_bytes=getattr(settings, "PDF_CACHE_MAX_BYTES", 200 * 1024 * 1024),
+                )
+    return _cache
@@ -0,0 +1,159 @@
+"""
+Resource loading for xhtml2pdf.
+
+``link_callback`` maps ``MEDIA_URL`` and ``STATIC_URL`` references in the
+rendered HTML to local files, so PDFs never fetch the site's own images
+over HTTP (and work when the site isn't reachable from the renderer).
+
+``DecodedImageCache`` keeps decoded images (xhtml2pdf's PmlImageReader,
+with the PIL image and its RGB data) per process, keyed by file path, mtime
+and size. xhtml2pdf decodes every ``<img>`` at least twice per PDF (to size
+it and to draw it); with the cache the college logo and a resume's photo
+are decoded once per process instead of on every render.
+"""
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+
+from . import lazy_libs
+
+
+def _local_path(uri):
+    path = unquote(urlsplit(uri).path)
+    media_url = settings.MEDIA_URL
+    static_url = settings.STATIC_URL
+    try:
+        if media_url and path.startswith(media_url):
+            return safe_join(settings.MEDIA_ROOT, path[len(media_url):])
+        if static_url and path.startswith(static_url):
+            relative = path[len(static_url):]
+            found = finders.find(relative)
+            if found:
+                return found
+            static_root = getattr(settings, "STATIC_ROOT", None)
+            if static_root:
+                return safe_join(static_root, relative)
+    except SuspiciousFileOperation:
+        return None
+    return None
+
+
+def link_callback(uri, rel):
+    """Map media/static URLs to files; other URIs (file paths, data:, remote) pass through."""
+    path = _local_path(uri)
+    if path and os.path.isfile(path):
+        return path
+    return uri
+
+
+class DecodedImageCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        return counters
+
+    @staticmethod
+    def key_for(src):
+        """(path, mtime, size) for a local image file, else None (not cached)."""
+        if not isinstance(src, str) or not os.path.isabs(src):
+            return None
+        try:
+            stat = os.stat(src)
+        except OSError:
+            return None
+        return (src, stat.st_mtime_ns, stat.st_size)
+
+    def get(self, key):
+        with self._lock:
+            reader = self._entries.get(key)
+            if reader is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return reader
+
+    def put(self, key, reader):
+        with self._lock:
+            self._entries[key] = reader
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _shareable(reader, data):
+    """
+    Prepare a PmlImageReader for use by several renders (and threads): the
+    image is fully decoded now, and JPEG passthrough reads from its own
+    buffer each time instead of the reader's shared file object.
+    """
+    image = getattr(reader, "_image", None)
+    if image is not None:
+        image.load()
+    if reader.jpeg_fh() is not None:
+        # JPEGs are embedded as they are
+        reader.jpeg_fh = lambda: BytesIO(data)
+    else:
+        reader.getRGBData()  # computed once and kept on the reader
+    return reader
+
+
+_cache = None
+_install_lock = threading.Lock()
+_installed = False
+
+
+def get_image_cache() -> DecodedImageCache:
+    global _cache
+    if _cache is None:
+        with _install_lock:
+            if _cache is None:
+                _cache = DecodedImageCache(getattr(settings, "PDF_IMAGE_CACHE_ENTRIES", 64))
+    return _cache
+
+
+def install_image_cache():
+    """Route xhtml2pdf's image decoding through the cache (once per process)."""
+    global _installed
+    if _installed:
+        return
+    cache = get_image_cache()
+    with _install_lock:
+        if _installed:
+            return
+        pml_image = lazy_libs.xhtml2pdf_reportlab().PmlImage
+        decode = pml_image.getImage
+
+        def getImage(self):
+            key = cache.key_for(self.src)
+            if key is None:
+                return decode(self)
+            reader = cache.get(key)
+            if reader is None:
+                reader = _shareable(decode(self), self._imgdata)
+                cache.put(key, reader)
+            return reader
+
+        pml_image.getImage = getImage
+        _installed = True
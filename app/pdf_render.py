@@ -0,0 +1,114 @@
+"""
+Resume HTML -> PDF rendering (xhtml2pdf) and the inputs that identify a
+rendered PDF: template source and injected CSS.
+"""
+import hashlib
+import os
+import threading
+from io import BytesIO
+
+from django.template.loader import get_template, render_to_string
+
+from . import lazy_libs
+from .pdf_cache import get_pdf_cache
+from .pdf_links import install_image_cache, link_callback
+from .resume_context import build_resume_context
+
+# Compact CSS to stay within 1–2 pages
+PDF_CSS = """
+    <style>
+        @page { size: A4; margin: 14mm; }
+        body { font-family: Arial, sans-serif; font-size: 11pt; line-height: 1.35; }
+        h1 { font-size: 20pt; margin: 0 0 6px 0; }
+        h2 { font-size: 13pt; margin: 12px 0 6px 0; }
+        p, li { font-size: 11pt; margin: 0 0 4px 0; }
+        .section, div { page-break-inside: avoid; }
+    </style>
+"""
+
+PDF_CSS_HASH = hashlib.sha256(PDF_CSS.encode("utf-8")).hexdigest()
+
+
+class PDFRenderError(Exception):
+    pass
+
+
+_template_hashes = {}
+_template_hashes_lock = threading.Lock()
+
+
+def template_source_hash(template_name: str) -> str:
+    """
+    SHA-256 of a template's source file, recomputed only when the file's
+    mtime changes (so edits during development invalidate cached renders).
+    """
+    origin = get_template(template_name).origin.name
+    try:
+        mtime = os.stat(origin).st_mtime_ns
+    except (OSError, TypeError):
+        mtime = None
+
+    cached = _template_hashes.get(template_name)
+    if cached is not None and cached[0] == (origin, mtime):
+        return cached[1]
+
+    with open(origin, "rb") as fh:
+        digest = hashlib.sha256(fh.read()).hexdigest()
+    with _template_hashes_lock:
+        _template_hashes[template_name] = ((origin, mtime), digest)
+    return digest
+
+
+def template_mtime(template_name: str):
+    """Modification time (seconds) of a template's source file, or None."""
+    try:
+        return os.stat(get_template(template_name).origin.name).st_mtime
+    except (OSError, TypeError):
+        return None
+
+
+def resume_pdf_key(resume, template_slug: str) -> str:
+    """Cache key for a rendered resume PDF; changes whenever its output would."""
+    parts = [
+        str(resume.pk),
+        resume.updated_at.isoformat() if resume.updated_at else "",
+        template_slug,
+        template_source_hash(f"resume/{template_slug}.html"),
+        PDF_CSS_HASH,
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def render_pdf(html_string: str) -> bytes:
+    """Render resume HTML (plus PDF_CSS) to PDF bytes."""
+    html = f"{PDF_CSS}\n{html_string}"
+    result = BytesIO()
+    install_image_cache()
+    pdf = lazy_libs.pisa().CreatePDF(html, dest=result, link_callback=link_callback)
+    if pdf.err:
+        raise PDFRenderError("Error generating PDF")
+    return result.getvalue()
+
+
+def render_resume_pdf(resume, template_slug: str) -> bytes:
+    """Render a resume with one of the RESUME_TEMPLATES to PDF bytes."""
+    html_string = render_to_string(
+        f"resume/{template_slug}.html",
+        build_resume_context(resume, template_slug, for_pdf=True),
+    )
+    return render_pdf(html_string)
+
+
+def ensure_cached_pdf(resume, template_slug: str):
+    """
+    Make sure the PDF for this resume/template is in the artifact cache and
+    return ``(cache_key, path)``. Renders only on a cache miss.
+    """
+    pdf_cache = get_pdf_cache()
+    cache_key = resume_pdf_key(resume, template_slug)
+    cached = pdf_cache.open(cache_key)
+    if cached is not None:
+        cached.close()
+        return cache_key, cached.name
+    path = pdf_cache.put(cache_key, render_resume_pdf(resume, template_slug))
+    return cache_key, str(path)
@@ -0,0 +1,120 @@
+"""
+Resized copies of resume photos for rendering.
+
+Next to each content-addressed original (app/photo_storage.py) we keep:
+
+- ``<hash>.thumb.jpg``: a small JPEG for the HTML preview, which the browser
+  crops into the photo box with ``object-fit``;
+- ``<hash>.print-<w>x<h>.jpg``: a JPEG cropped to a template's photo box
+  (PHOTO_BOXES) at print resolution, for the PDF. xhtml2pdf ignores
+  ``object-fit`` and would otherwise embed the full upload and stretch it.
+
+EXIF (camera data, GPS) is dropped; its orientation is applied first.
+Derivatives are made when the original is stored and, for photos stored
+before that, on first render. Legacy photo names outside the
+content-addressed layout are rendered from the original.
+"""
+import os
+from io import BytesIO
+
+from django.conf import settings
+
+from .photo_storage import get_photo_storage, photo_hash, write_file_atomic
+from .resume_context import PHOTO_BOXES
+
+THUMB_VARIANT = "thumb"
+THUMB_MAX_SIZE = 280  # px, longest side; about 2x the CSS box
+CSS_DPI = 96
+
+
+def print_variant(box):
+    return "print-%dx%d" % box
+
+
+def derivative_name(name, variant):
+    stem, _ = os.path.splitext(name)
+    return f"{stem}.{variant}.jpg"
+
+
+def all_variants():
+    return [THUMB_VARIANT] + sorted({print_variant(box) for box in PHOTO_BOXES.values()})
+
+
+def _print_pixels(box):
+    dpi = getattr(settings, "PHOTO_PRINT_DPI", 300)
+    return tuple(round(side * dpi / CSS_DPI) for side in box)
+
+
+def _render(image, variant):
+    from PIL import ImageOps
+
+    if variant == THUMB_VARIANT:
+        image = image.copy()
+        image.thumbnail((THUMB_MAX_SIZE, THUMB_MAX_SIZE))
+        quality = 80
+    else:
+        width, height = map(int, variant[len("print-"):].split("x"))
+        image = ImageOps.fit(image, _print_pixels((width, height)))
+        quality = 88
+    out = BytesIO()
+    # No exif= argument, so no EXIF block is written
+    image.save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def _flatten(image):
+    """RGB with EXIF orientation applied and transparency on white."""
+    from PIL import Image, ImageOps
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def make_derivatives(storage, name, variants=None):
+    """Write the missing derivatives of a stored photo; returns the names written."""
+    from PIL import Image
+
+    if photo_hash(name) is None:
+        return []
+    missing = [
+        variant for variant in (variants or all_variants())
+        if not storage.exists(derivative_name(name, variant))
+    ]
+    if not missing:
+        return []
+    try:
+        with storage.open(name) as fh, Image.open(fh) as original:
+            image = _flatten(original)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return []  # unreadable image: renders fall back to the original
+    written = []
+    for variant in missing:
+        derived = derivative_name(name, variant)
+        write_file_atomic(storage.path(derived), [_render(image, variant)], storage.file_permissions_mode)
+        written.append(derived)
+    return written
+
+
+def photo_src(resume, template_slug, for_pdf=False):
+    """
+    The photo URL for a template: the thumbnail for the preview, the print
+    derivative for the PDF (read from disk via app/pdf_links.py). None if
+    there's no photo.
+    """
+    name = resume.photo.name if resume.photo else ""
+    if not name:
+        return None
+    storage = get_photo_storage()
+    box = PHOTO_BOXES.get(template_slug)
+    variant = print_variant(box) if for_pdf and box else THUMB_VARIANT
+    derived = derivative_name(name, variant)
+    if photo_hash(name) is not None and (
+        storage.exists(derived) or make_derivatives(storage, name, [variant])
+    ):
+        name = derived
+    return storage.url(name)
@@ -0,0 +1,54 @@
+"""
+Reference counts of stored photos (StoredPhoto), adjusted by the Resume
+signals when a resume gets, changes or loses its photo. Bulk updates bypass
+signals; ``manage.py gc_photos`` recounts everything before collecting.
+"""
+from django.db.models import Count, F
+
+from .models import Resume, StoredPhoto
+from .photo_storage import get_photo_storage, photo_hash
+
+
+def rebuild_photo_refs(name):
+    """Recount one photo's references from the resumes table."""
+    storage = get_photo_storage()
+    count = Resume.objects.filter(photo=name).count()
+    photo, _ = StoredPhoto.objects.update_or_create(
+        name=name,
+        defaults={
+            "sha256": photo_hash(name) or "",
+            "size": storage.size(name) if storage.exists(name) else 0,
+            "ref_count": count,
+        },
+    )
+    return photo
+
+
+def add_photo_ref(name):
+    if not name:
+        return
+    if not StoredPhoto.objects.filter(name=name).update(ref_count=F("ref_count") + 1):
+        # First reference: the count already includes the saved resume
+        rebuild_photo_refs(name)
+
+
+def release_photo_ref(name):
+    """Drop one reference; the file stays until gc_photos removes it."""
+    if name:
+        StoredPhoto.objects.filter(name=name).update(ref_count=F("ref_count") - 1)
+
+
+def rebuild_all_photo_refs():
+    """Recount every photo; returns ``{name: count}`` of referenced photos."""
+    counts = dict(
+        Resume.objects.exclude(photo="").exclude(photo__isnull=True)
+        .order_by()
+        .values_list("photo")
+        .annotate(n=Count("id"))
+    )
+    for name, count in counts.items():
+        if StoredPhoto.objects.filter(name=name).exclude(ref_count=count).update(ref_count=count) == 0:
+            if not StoredPhoto.objects.filter(name=name).exists():
+                rebuild_photo_refs(name)
+    StoredPhoto.objects.exclude(name__in=list(counts)).exclude(ref_count=0).update(ref_count=0)
+    return counts
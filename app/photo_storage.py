@@ -0,0 +1,110 @@
+"""
+Content-addressed storage for resume photos.
+
+A photo is stored once under the SHA-256 of its bytes, sharded as
+``photos/<h[:2]>/<h[2:4]>/<h>.<ext>``; saving the same image again (a
+re-upload, another resume) returns the existing name instead of writing a
+copy. ``StoredPhoto`` rows count how many resumes reference each file (kept
+up to date by the Resume signals, app/signals.py), and
+``manage.py gc_photos`` deletes files nothing references any more.
+
+Resized copies for rendering (app/photo_derivatives.py) are written next to
+the original when it is first stored.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+PHOTO_DIR = "photos"
+
+# Extensions are normalized so the same bytes always get the same name
+EXTENSIONS = {".jpeg": ".jpg", ".jpe": ".jpg", ".tif": ".tiff"}
+
+# Derived files add a variant before the extension: <hash>.thumb.jpg
+_NAME_RE = re.compile(r"^photos/([0-9a-f]{2})/([0-9a-f]{2})/([0-9a-f]{64})(\.[a-z0-9.\-]+)$")
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():  # chunks() rewinds the file first
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_extension(name):
+    """
+    The normalized extension of an image file name; ``.bin`` for anything
+    else, including SVG (it can carry scripts and is served from our origin).
+    """
+    extension = os.path.splitext(name)[1].lower()
+    extension = EXTENSIONS.get(extension, extension)
+    mime_type = mimetypes.guess_type("photo" + extension)[0] or ""
+    if re.fullmatch(r"\.[a-z0-9]+", extension) and mime_type.startswith("image/") and mime_type != "image/svg+xml":
+        return extension
+    return ".bin"
+
+
+def photo_name(sha256, extension):
+    return f"{PHOTO_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def photo_hash(name):
+    """The SHA-256 a content-addressed name was stored under, or None for legacy names."""
+    match = _NAME_RE.match(name or "")
+    if match and match.group(1) == match.group(3)[:2] and match.group(2) == match.group(3)[2:4]:
+        return match.group(3)
+    return None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content and never stores a duplicate."""
+
+    def get_available_name(self, name, max_length=None):
+        # Same name means same content; there's nothing to avoid
+        return name
+
+    def _save(self, name, content):
+        from .photo_derivatives import make_derivatives
+
+        extension = image_extension(name)
+        name = photo_name(content_hash(content), extension)
+        path = self.path(name)
+        try:
+            # Counts as new for gc_photos' grace period: the resume
+            # referencing it may not be saved yet.
+            os.utime(path)
+        except FileNotFoundError:
+            # A concurrent upload of the same image may win the race; the
+            # bytes are identical either way.
+            write_file_atomic(path, content.chunks(), self.file_permissions_mode)
+        make_derivatives(self, name)
+        return name
+
+
+def write_file_atomic(path, chunks, permissions=None):
+    """Write via a temp file and rename, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+        if permissions is not None:
+            os.chmod(tmp, permissions)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def get_photo_storage():
+    return ContentAddressedStorage()
@@ -0,0 +1,91 @@
+"""
+Cache of rendered resume preview pages, on the ``RESUME_PREVIEW_CACHE_ALIAS``
+cache.
+
+There is one entry per resume and template, stored with the version it was
+rendered from: the resume's ``updated_at``, the template source hash and
+RENDER_CONTEXT_VERSION. A version mismatch is a miss, so edits to a resume
+or a template never serve stale HTML; Resume saves and deletes also drop
+the resume's entries right away (app/signals.py).
+
+The resume templates use no request context (user, CSRF token, messages),
+so the same HTML can be served on every request.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+
+from .pdf_render import template_source_hash
+from .resume_context import RENDER_CONTEXT_VERSION, RESUME_TEMPLATES, build_resume_context
+
+
+class PreviewCache:
+    def __init__(self, alias, timeout):
+        self.alias = alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, resume_id, template_slug):
+        return f"resume-preview:{resume_id}:{template_slug}"
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+        return counters
+
+    def version(self, resume, template_slug):
+        return (
+            resume.updated_at.isoformat(),
+            template_source_hash(f"resume/{template_slug}.html"),
+            RENDER_CONTEXT_VERSION,
+        )
+
+    def get_or_render(self, resume, template_slug):
+        """Returns ``(html, hit)``."""
+        key = self._key(resume.id, template_slug)
+        version = self.version(resume, template_slug)
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._count("hits")
+            return cached[1], True
+
+        self._count("misses")
+        html = render_to_string(
+            f"resume/{template_slug}.html",
+            build_resume_context(resume, template_slug),
+        )
+        self.cache.set(key, (version, html), self.timeout)
+        return html, False
+
+    def invalidate(self, resume_id):
+        self.cache.delete_many([self._key(resume_id, slug) for slug in RESUME_TEMPLATES])
+        self._count("invalidations")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_preview_cache() -> PreviewCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PreviewCache(
+                    alias=getattr(settings, "RESUME_PREVIEW_CACHE_ALIAS", "default"),
+                    timeout=getattr(settings, "RESUME_PREVIEW_CACHE_TTL", 24 * 3600),
+                )
+    return _cache
@@ -0,0 +1,108 @@
+"""
+Process pool for rendering resume PDFs outside the web workers.
+
+Workers are spawned (not forked) and run ``django.setup()`` themselves, so
+each one has its own database connection. Tasks take ids, not model
+instances, and write their output into the PDF artifact cache.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+def create_pool(workers):
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "resume_generator.settings"),),
+    )
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool():
+    """Process-wide render pool, sized by ``PDF_RENDER_WORKERS``."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = create_pool(getattr(settings, "PDF_RENDER_WORKERS", 2))
+    return _pool
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# -- tasks (run inside pool workers) ------------------------------------------
+
+def run_render_job(job_id):
+    """Render the PDF for a claimed PDFRenderJob and record the outcome."""
+    from django.db import close_old_connections
+    from django.utils import timezone
+
+    from .models import PDFRenderJob
+    from .pdf_cache import get_pdf_cache
+    from .pdf_render import render_resume_pdf, resume_pdf_key
+
+    close_old_connections()
+    job = PDFRenderJob.objects.select_related("resume").get(id=job_id)
+
+    def progress(value):
+        PDFRenderJob.objects.filter(id=job_id).update(progress=value)
+
+    try:
+        cache_key = resume_pdf_key(job.resume, job.template_slug)
+        if not get_pdf_cache().exists(cache_key):
+            progress(20)
+            pdf_bytes = render_resume_pdf(job.resume, job.template_slug)
+            progress(90)
+            get_pdf_cache().put(cache_key, pdf_bytes)
+        PDFRenderJob.objects.filter(id=job_id).update(
+            status=PDFRenderJob.DONE,
+            progress=100,
+            cache_key=cache_key,
+            finished_at=timezone.now(),
+        )
+    except Exception as e:
+        PDFRenderJob.objects.filter(id=job_id).update(
+            status=PDFRenderJob.FAILED,
+            error=str(e)[:1000],
+            finished_at=timezone.now(),
+        )
+    finally:
+        close_old_connections()
+    return job_id
+
+
+def render_to_cache(resume_id, template_slug):
+    """Ensure one resume/template PDF is cached; returns its path."""
+    from django.db import close_old_connections
+
+    from .models import Resume
+    from .pdf_render import ensure_cached_pdf
+
+    close_old_connections()
+    try:
+        resume = Resume.objects.get(id=resume_id)
+        _, path = ensure_cached_pdf(resume, template_slug)
+    finally:
+        close_old_connections()
+    return path
@@ -0,0 +1,83 @@
+"""
+DB-backed queue of PDF render jobs (``PDFRenderJob``).
+
+The web process only inserts rows; ``manage.py render_worker`` claims queued
+jobs and renders them on a process pool (app/render_pool.py). Claiming is a
+conditional UPDATE, so several worker commands can share one queue.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import PDFRenderJob
+from .pdf_cache import get_pdf_cache
+from .pdf_render import resume_pdf_key
+
+
+def enqueue_render(resume, template_slug, user):
+    """
+    Return a job for rendering this resume/template, reusing a pending one.
+    If the PDF is already cached the job is created as done.
+    """
+    cache_key = resume_pdf_key(resume, template_slug)
+    if get_pdf_cache().exists(cache_key):
+        done = PDFRenderJob.objects.filter(
+            resume=resume,
+            template_slug=template_slug,
+            status=PDFRenderJob.DONE,
+            cache_key=cache_key,
+        ).order_by("-created_at").first()
+        if done is not None:
+            return done
+        now = timezone.now()
+        return PDFRenderJob.objects.create(
+            user=user,
+            resume=resume,
+            template_slug=template_slug,
+            status=PDFRenderJob.DONE,
+            progress=100,
+            cache_key=cache_key,
+            started_at=now,
+            finished_at=now,
+        )
+
+    pending = PDFRenderJob.objects.filter(
+        resume=resume,
+        template_slug=template_slug,
+        status__in=[PDFRenderJob.QUEUED, PDFRenderJob.RUNNING],
+        created_at__gte=resume.updated_at,
+    ).order_by("-created_at").first()
+    if pending is not None:
+        return pending
+
+    return PDFRenderJob.objects.create(user=user, resume=resume, template_slug=template_slug)
+
+
+def claim_jobs(limit):
+    """Atomically move up to ``limit`` queued jobs to running; returns their ids."""
+    claimed = []
+    candidates = (
+        PDFRenderJob.objects.filter(status=PDFRenderJob.QUEUED)
+        .order_by("created_at")
+        .values_list("id", flat=True)[:limit * 2]
+    )
+    for job_id in candidates:
+        if len(claimed) >= limit:
+            break
+        updated = PDFRenderJob.objects.filter(id=job_id, status=PDFRenderJob.QUEUED).update(
+            status=PDFRenderJob.RUNNING,
+            started_at=timezone.now(),
+            progress=10,
+        )
+        if updated:
+            claimed.append(job_id)
+    return claimed
+
+
+def requeue_stale_jobs(older_than_seconds):
+    """Put back jobs left running by a worker that died mid-render."""
+    cutoff = timezone.now() - timedelta(seconds=older_than_seconds)
+    return PDFRenderJob.objects.filter(
+        status=PDFRenderJob.RUNNING,
+        started_at__lt=cutoff,
+    ).update(status=PDFRenderJob.QUEUED, started_at=None, progress=0)
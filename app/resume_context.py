@@ -0,0 +1,97 @@
+"""
+Template context for the resume templates in app/templates/resume/, shared
+by the preview, the PDF download and the background PDF renderers.
+
+The parsed parts (education rows, line lists, name split) are computed when
+a Resume is saved and stored in ``Resume.render_context``; rendering only
+re-parses rows whose stored context is older than RENDER_CONTEXT_VERSION.
+"""
+
+# Bump when compute_render_context() output changes, then run
+# manage.py backfill_render_context.
+RENDER_CONTEXT_VERSION = 1
+
+# Slugs of the templates in app/templates/resume/ that users may pick.
+RESUME_TEMPLATES = [
+    "professional_classic",
+    "creative_minimal",
+    "modern_photo_style",
+]
+
+# Size in CSS pixels of the photo box in templates that show the photo
+# (see app/photo_derivatives.py). Keep in step with the templates' CSS.
+PHOTO_BOXES = {
+    "creative_minimal": (120, 140),
+    "professional_classic": (120, 120),
+}
+
+
+def split_lines(text: str):
+    if not text:
+        return []
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def split_name(full_name: str):
+    """Split full name into first and last name parts."""
+    if not full_name:
+        return ["", ""]
+    parts = full_name.strip().split()
+    if len(parts) == 0:
+        return ["", ""]
+    elif len(parts) == 1:
+        return [parts[0], ""]
+    else:
+        return [parts[0], " ".join(parts[1:])]
+
+
+def parse_education(resume):
+    quals = split_lines(resume.edu_qualification)
+    years = resume.edu_year.splitlines() if resume.edu_year else []
+    colleges = resume.edu_college.splitlines() if resume.edu_college else []
+    universities = resume.edu_university.splitlines() if resume.edu_university else []
+    cgpas = resume.edu_cgpa.splitlines() if resume.edu_cgpa else []
+    classes = resume.edu_class.splitlines() if resume.edu_class else []
+
+    rows = []
+    for idx, qual in enumerate(quals):
+        rows.append({
+            "qualification": qual,
+            "year": years[idx] if idx < len(years) else "",
+            "college": colleges[idx] if idx < len(colleges) else "",
+            "university": universities[idx] if idx < len(universities) else "",
+            "cgpa": cgpas[idx] if idx < len(cgpas) else "",
+            "class": classes[idx] if idx < len(classes) else "",
+        })
+    return rows
+
+
+def compute_render_context(resume):
+    """The JSON-serializable, template-independent part of the context."""
+    name_parts = split_name(resume.full_name)
+    return {
+        "education_rows": parse_education(resume),
+        "skills_list": split_lines(resume.skills),
+        "projects_list": split_lines(resume.projects),
+        "achievements_list": split_lines(resume.achievements),
+        "certifications_list": split_lines(resume.certifications),
+        "languages_list": split_lines(resume.languages),
+        "hobbies_list": split_lines(resume.hobbies),
+        "first_name": name_parts[0],
+        "last_name": name_parts[1],
+    }
+
+
+def build_resume_context(resume, template_slug: str, for_pdf=False):
+    from .photo_derivatives import photo_src
+
+    if resume.render_context_version == RENDER_CONTEXT_VERSION and resume.render_context:
+        parts = resume.render_context
+    else:
+        parts = compute_render_context(resume)
+    return {
+        "r": resume,
+        "template_slug": template_slug,
+        "photo_src": photo_src(resume, template_slug, for_pdf=for_pdf),
+        **parts,
+    }
@@ -0,0 +1,68 @@
+"""
+Keyset-paginated resume listings for the profile page.
+
+Pages are ordered newest first by ``(created_at, id)`` and continue from an
+opaque cursor holding the last row's key, so every page costs one indexed
+range query no matter how deep the user scrolls (unlike OFFSET, which
+re-reads all the skipped rows). Only the columns the resume cards show
+are loaded; the long TextFields stay in the database.
+"""
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import Resume
+
+# Everything templates/profile/resume_card.html uses
+RESUME_CARD_FIELDS = ("id", "full_name", "email", "created_at", "ats_score")
+
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(resume):
+    raw = f"{resume.created_at.isoformat()}|{resume.id}"
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """``(created_at, id)`` from a cursor made by encode_cursor()."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        created_at, resume_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(resume_id)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def resume_page(user, cursor=None, page_size=None):
+    """
+    One page of the user's resumes, newest first; returns
+    ``(resumes, next_cursor)``, next_cursor being None on the last page.
+    """
+    if page_size is None:
+        page_size = getattr(settings, "RESUME_PAGE_SIZE", 12)
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    queryset = (
+        Resume.objects.filter(user=user)
+        .only(*RESUME_CARD_FIELDS)
+        .order_by("-created_at", "-id")
+    )
+    if cursor:
+        created_at, resume_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=resume_id)
+        )
+
+    # One extra row tells whether there is a next page without a COUNT
+    resumes = list(queryset[:page_size + 1])
+    if len(resumes) > page_size:
+        resumes = resumes[:page_size]
+        return resumes, encode_cursor(resumes[-1])
+    return resumes, None
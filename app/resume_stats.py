@@ -0,0 +1,103 @@
+"""
+Dashboard resume statistics.
+
+``aggregate_resume_stats`` computes everything in a single query.
+``get_resume_stats`` reads the materialized ``UserResumeStats`` row instead
+when ``RESUME_STATS_MATERIALIZED`` is on, so the cost doesn't grow with the
+number of resumes. The row is maintained incrementally by the Resume
+signals (app/signals.py); ``manage.py rebuild_resume_stats`` repairs it
+after bulk updates, which bypass signals.
+"""
+from django.conf import settings
+from django.db.models import Avg, Count, F, Max, OuterRef, Q, Subquery, Sum
+
+from .models import Resume, UserResumeStats
+
+
+def aggregate_resume_stats(user_id):
+    """Counts, average ATS score and last update of a user's resumes, in one query."""
+    row = Resume.objects.filter(user_id=user_id).aggregate(
+        total=Count("id"),
+        analyzed=Count("id", filter=Q(analyzed=True)),
+        avg_ats=Avg("ats_score"),
+        last_updated=Max("updated_at"),
+    )
+    return {
+        "total_resumes": row["total"],
+        "analyzed_count": row["analyzed"],
+        "avg_ats": row["avg_ats"] or 0,
+        "last_updated": row["last_updated"],
+    }
+
+
+def rebuild_user_stats(user_id):
+    """Recompute a user's UserResumeStats row from the resumes table."""
+    row = Resume.objects.filter(user_id=user_id).aggregate(
+        total=Count("id"),
+        analyzed=Count("id", filter=Q(analyzed=True)),
+        ats_sum=Sum("ats_score"),
+        last_updated=Max("updated_at"),
+    )
+    stats, _ = UserResumeStats.objects.update_or_create(
+        user_id=user_id,
+        defaults={
+            "resume_count": row["total"],
+            "analyzed_count": row["analyzed"],
+            "ats_score_sum": row["ats_sum"] or 0,
+            "last_updated": row["last_updated"],
+        },
+    )
+    return stats
+
+
+def apply_stats_delta(user_id, resumes=0, analyzed=0, ats_score=0, last_updated=None):
+    """Adjust a user's counters in place; builds the row if it doesn't exist yet."""
+    changes = {
+        "resume_count": F("resume_count") + resumes,
+        "analyzed_count": F("analyzed_count") + analyzed,
+        "ats_score_sum": F("ats_score_sum") + ats_score,
+    }
+    if last_updated is not None:
+        changes["last_updated"] = last_updated
+    if not UserResumeStats.objects.filter(user_id=user_id).update(**changes):
+        # First touch: the aggregate already includes this change
+        rebuild_user_stats(user_id)
+
+
+def remove_from_stats(user_id, analyzed, ats_score):
+    """
+    Account for a deleted resume. Never creates the row (the user may be
+    being deleted too); last_updated is recomputed from the remaining resumes.
+    """
+    latest = (
+        Resume.objects.filter(user_id=OuterRef("user_id"))
+        .order_by()
+        .values("user_id")
+        .annotate(latest=Max("updated_at"))
+        .values("latest")
+    )
+    UserResumeStats.objects.filter(user_id=user_id).update(
+        resume_count=F("resume_count") - 1,
+        analyzed_count=F("analyzed_count") - int(analyzed),
+        ats_score_sum=F("ats_score_sum") - ats_score,
+        last_updated=Subquery(latest),
+    )
+
+
+def stats_enabled():
+    return getattr(settings, "RESUME_STATS_MATERIALIZED", True)
+
+
+def get_resume_stats(user):
+    """Dashboard stats for ``user`` as a dict (see aggregate_resume_stats)."""
+    if not stats_enabled():
+        return aggregate_resume_stats(user.pk)
+    stats = UserResumeStats.objects.filter(user_id=user.pk).first()
+    if stats is None:
+        stats = rebuild_user_stats(user.pk)
+    return {
+        "total_resumes": stats.resume_count,
+        "analyzed_count": stats.analyzed_count,
+        "avg_ats": stats.avg_ats,
+        "last_updated": stats.last_updated,
+    }
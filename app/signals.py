@@ -0,0 +1,90 @@
+"""
+Keep UserResumeStats, photo reference counts and the preview cache in step
+with Resume saves and deletes. Connected in AppConfig.ready().
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Resume
+from .photo_refs import add_photo_ref, release_photo_ref
+from .preview_cache import get_preview_cache
+from .resume_stats import apply_stats_delta, rebuild_user_stats, remove_from_stats, stats_enabled
+
+
+@receiver(pre_save, sender=Resume, dispatch_uid="resume_stats_pre_save")
+def remember_previous_resume_stats(sender, instance, raw=False, **kwargs):
+    instance._previous_stats = None
+    if raw or instance._state.adding or not stats_enabled():
+        return
+    instance._previous_stats = (
+        Resume.objects.filter(pk=instance.pk).values_list("user_id", "analyzed", "ats_score").first()
+    )
+
+
+@receiver(post_save, sender=Resume, dispatch_uid="resume_stats_post_save")
+def update_resume_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not stats_enabled():
+        return
+    if created:
+        apply_stats_delta(
+            instance.user_id,
+            resumes=1,
+            analyzed=int(instance.analyzed),
+            ats_score=instance.ats_score,
+            last_updated=instance.updated_at,
+        )
+        return
+
+    previous = getattr(instance, "_previous_stats", None)
+    if previous is None or previous[0] != instance.user_id:
+        # Unknown previous state or the resume changed owner
+        rebuild_user_stats(instance.user_id)
+        if previous is not None:
+            rebuild_user_stats(previous[0])
+        return
+    _, was_analyzed, old_score = previous
+    apply_stats_delta(
+        instance.user_id,
+        analyzed=int(instance.analyzed) - int(was_analyzed),
+        ats_score=instance.ats_score - old_score,
+        last_updated=instance.updated_at,
+    )
+
+
+@receiver(post_delete, sender=Resume, dispatch_uid="resume_stats_post_delete")
+def update_resume_stats_on_delete(sender, instance, **kwargs):
+    if stats_enabled():
+        remove_from_stats(instance.user_id, instance.analyzed, instance.ats_score)
+
+
+@receiver(post_save, sender=Resume, dispatch_uid="resume_preview_post_save")
+@receiver(post_delete, sender=Resume, dispatch_uid="resume_preview_post_delete")
+def invalidate_resume_preview(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_preview_cache().invalidate(instance.pk)
+
+
+@receiver(pre_save, sender=Resume, dispatch_uid="resume_photo_pre_save")
+def remember_previous_photo(sender, instance, raw=False, **kwargs):
+    instance._previous_photo = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_photo = (
+        Resume.objects.filter(pk=instance.pk).values_list("photo", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Resume, dispatch_uid="resume_photo_post_save")
+def update_photo_refs_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_previous_photo", None) or ""
+    current = instance.photo.name or ""
+    if previous != current:
+        add_photo_ref(current)
+        release_photo_ref(previous)
+
+
+@receiver(post_delete, sender=Resume, dispatch_uid="resume_photo_post_delete")
+def release_photo_on_delete(sender, instance, **kwargs):
+    release_photo_ref(instance.photo.name)
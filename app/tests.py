@@ -1,3 +1,244 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .ai_analysis import analyze_text, stream_job_events
+from .ai_cache import SingleFlight
+from .ai_hedge import DeadlineExceeded, HedgeError, hedged_call
+from .ai_providers import AnalysisProvider
+from .ai_stream import JobStream, StreamClaim
+from .json_stream import IncrementalJSONParser
+from .models import AIAnalysisJob, AnalysisResult
+
+
+def analysis_json(prefix, companies=10):
+    return json.dumps({
+        "top_companies": [{"name": f"{prefix}-{i}"} for i in range(companies)],
+        "study_plan": {"overview": f"{prefix} plan"},
+    })
+
+
+class IncrementalJSONParserTests(SimpleTestCase):
+    def feed_in_chunks(self, text, size):
+        parser = IncrementalJSONParser(depth=2)
+        events = []
+        for start in range(0, len(text), size):
+            events += parser.feed(text[start:start + size])
+        return parser, events
+
+    def test_values_split_across_every_chunk_boundary(self):
+        text = '```json\n{"top_companies": [{"name": "A \\"quoted\\" \\u00e9}"}, {"name": "B"}], "study_plan": {"overview": "x, [y]"}}\n```'
+        expected = [
+            (("top_companies", 0), {"name": 'A "quoted" é}'}),
+            (("top_companies", 1), {"name": "B"}),
+            (("study_plan", "overview"), "x, [y]"),
+        ]
+        for size in (1, 2, 3, 7, len(text)):
+            with self.subTest(chunk_size=size):
+                parser, events = self.feed_in_chunks(text, size)
+                self.assertEqual(events, expected)
+                self.assertTrue(parser.done)
+
+    def test_value_is_reported_only_once_it_is_complete(self):
+        parser = IncrementalJSONParser(depth=2)
+        self.assertEqual(parser.feed('{"top_companies": [{"name": "A'), [])
+        self.assertEqual(parser.feed('"}'), [(("top_companies", 0), {"name": "A"})])
+
+    def test_scalars_split_mid_token(self):
+        _, events = self.feed_in_chunks('{"scores": [12, true, null, -3.5]}', 1)
+        self.assertEqual([value for _, value in events], [12, True, None, -3.5])
+
+
+class HedgedCallTests(SimpleTestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown, wait=True)
+        self.started = []
+
+    def attempt(self, behaviour):
+        def attempt(candidate, timeout):
+            self.started.append(candidate)
+            return behaviour[candidate]()
+        return attempt
+
+    def test_first_answer_within_delay_does_not_hedge(self):
+        result = hedged_call(
+            ["a", "b"], self.attempt({"a": lambda: "A", "b": lambda: "B"}),
+            deadline=5, delay=1, executor=self.executor,
+        )
+        self.assertEqual(result, ("A", "a"))
+        self.assertEqual(self.started, ["a"])
+
+    def test_hedges_to_next_candidate_after_delay(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        behaviour = {"a": lambda: release.wait(5) and "A", "b": lambda: "B"}
+        started = time.monotonic()
+        result = hedged_call(["a", "b"], self.attempt(behaviour), deadline=5, delay=0.1, executor=self.executor)
+        self.assertEqual(result, ("B", "b"))
+        self.assertEqual(self.started, ["a", "b"])
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+    def test_failure_starts_next_candidate_immediately(self):
+        def fail():
+            raise ValueError("bad json")
+        started = time.monotonic()
+        result = hedged_call(["a", "b"], self.attempt({"a": fail, "b": lambda: "B"}), deadline=5, delay=3, executor=self.executor)
+        self.assertEqual(result, ("B", "b"))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_all_candidates_fail(self):
+        def fail(name):
+            def call():
+                raise RuntimeError(name)
+            return call
+        with self.assertRaises(HedgeError) as raised:
+            hedged_call(["a", "b"], self.attempt({"a": fail("a"), "b": fail("b")}), deadline=5, delay=0.05, executor=self.executor)
+        self.assertNotIsInstance(raised.exception, DeadlineExceeded)
+        self.assertEqual([(name, str(error)) for name, error in raised.exception.errors], [("a", "a"), ("b", "b")])
+
+    def test_deadline(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        slow = lambda: release.wait(5) and "late"  # noqa: E731
+        started = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            hedged_call(["a", "b"], self.attempt({"a": slow, "b": slow}), deadline=0.3, delay=0.05, executor=self.executor)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(self.started, ["a", "b"])
+
+
+class SingleFlightTests(SimpleTestCase):
+    def run_concurrently(self, flight, fn, callers=3):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.call(flight, fn))) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def call(self, flight, fn):
+        try:
+            return flight.do("key", fn)
+        except Exception as e:
+            return e
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        entered, release = threading.Event(), threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            entered.set()
+            release.wait(5)
+            return "value"
+
+        threads, results = self.run_concurrently(flight, compute)
+        entered.wait(5)
+        time.sleep(0.1)  # let the other callers join the flight
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [("value", False), ("value", True), ("value", True)])
+
+    def test_error_reaches_waiting_callers_and_is_not_kept(self):
+        flight = SingleFlight()
+        entered, release = threading.Event(), threading.Event()
+
+        def fail():
+            entered.set()
+            release.wait(5)
+            raise RuntimeError("upstream down")
+
+        threads, results = self.run_concurrently(flight, fail, callers=2)
+        entered.wait(5)
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual([str(result) for result in results], ["upstream down"] * 2)
+        self.assertEqual(flight.do("key", lambda: "fresh"), ("fresh", False))
+
+
+class TwoModelProvider(AnalysisProvider):
+    """Model "a" streams its answer slowly; model "b" answers all at once, later than the hedge delay."""
+    name = label = "two-models"
+
+    def models(self):
+        return ["a", "b"]
+
+    def stream(self, model_name, prompt, timeout):
+        text = analysis_json(model_name.upper())
+        if model_name == "a":
+            for start in range(0, len(text), 20):
+                yield text[start:start + 20]
+                time.sleep(0.1)
+        else:
+            time.sleep(0.5)
+            yield text
+
+    def mark_ok(self, model_name):
+        pass
+
+    def mark_failed(self, model_name):
+        pass
+
+
+@override_settings(AI_HEDGE_DEFAULT_DELAY=0.1, AI_STREAM_POLL_INTERVAL=0.01)
+class StreamOwnershipTests(TestCase):
+    def test_claim_hands_stream_to_winner(self):
+        stream = JobStream("claim-test")
+        claim = StreamClaim(stream)
+        claim.publish("a", '{"top_companies": [{"name": "A-0"}')
+        claim.publish("b", "ignored while a owns the stream")
+        self.assertEqual(stream.read(), (0, '{"top_companies": [{"name": "A-0"}'))
+        claim.finish("b", analysis_json("B"))
+        self.assertEqual(stream.read(), (1, analysis_json("B")))
+
+    def test_winner_change_mid_stream(self):
+        stream = JobStream("hedge-test")
+        data, model_name = analyze_text("resume", TwoModelProvider(), stream)
+        self.assertEqual(model_name, "b")
+        generation, text = stream.read()
+        self.assertEqual(generation, 1)
+        self.assertEqual(json.loads(text), data)
+
+    def test_done_replaces_items_streamed_by_the_losing_model(self):
+        user = User.objects.create_user("stream-user", password="x")
+        job = AIAnalysisJob.objects.create(user=user, status=AIAnalysisJob.RUNNING)
+        stream = JobStream(job.id)
+        partial = analysis_json("A")
+        stream.publish(partial[:partial.index('{"name": "A-4"}')], force=True)
+
+        def finish_with_b():
+            analysis = AnalysisResult(user=user, model_name="b")
+            analysis.data = json.loads(analysis_json("B"))
+            analysis.save()
+            AIAnalysisJob.objects.filter(id=job.id).update(status=AIAnalysisJob.DONE, analysis=analysis, model_name="b")
+
+        async def collect():
+            events = []
+            async for event in stream_job_events(job, lambda kind, key, value: json.dumps(value), lambda job: {}):
+                if not event.startswith("event: "):
+                    continue
+                name, data = event.split("\n")[:2]
+                events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+                if sum(1 for name, _ in events if name == "item") == 4 and len(events) < 10:
+                    await sync_to_async(finish_with_b)()
+            return events
+
+        events = async_to_sync(collect)()
+        names = [name for name, _ in events]
+        self.assertIn("reset", names)
+        after_reset = events[names.index("reset") + 1:]
+        shown = [data["html"] for name, data in after_reset if name == "item"]
+        self.assertEqual(sorted(shown), sorted(
+            [json.dumps({"name": f"B-{i}"}) for i in range(10)] + [json.dumps("B plan")]
+        ))
+        self.assertEqual(names[-1], "done")
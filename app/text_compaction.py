@@ -0,0 +1,216 @@
+"""
+Compaction of extracted resume text before it goes into the Gemini prompt.
+
+Steps:
+- drop page headers/footers that repeat across pages
+- join lines broken after a hyphen, keeping the hyphen (a word split
+  across lines can't be told apart from a compound like "e-commerce")
+- normalize bullets and whitespace
+- cap the result at a token budget, keeping the highest-value sections
+  (skills, experience, projects) first
+
+Tokens are estimated at ~4 characters each; that's close enough for
+budgeting and needs no tokenizer or API call.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from .extraction import PAGE_BREAK
+
+# Bump when the output of compact_text() changes for the same input.
+COMPACTION_VERSION = 2
+
+CHARS_PER_TOKEN = 4
+
+# Lower is more important. Text before the first heading (name, contact
+# details) is treated as priority 1.
+SECTION_PRIORITIES = {
+    "skills": 0,
+    "technical skills": 0,
+    "key skills": 0,
+    "experience": 0,
+    "work experience": 0,
+    "professional experience": 0,
+    "employment": 0,
+    "employment history": 0,
+    "internships": 0,
+    "internship": 0,
+    "projects": 1,
+    "academic projects": 1,
+    "personal projects": 1,
+    "summary": 2,
+    "profile": 2,
+    "professional summary": 2,
+    "objective": 2,
+    "career objective": 2,
+    "education": 2,
+    "certifications": 3,
+    "certificates": 3,
+    "achievements": 3,
+    "awards": 3,
+    "publications": 3,
+    "languages": 4,
+    "interests": 5,
+    "hobbies": 5,
+    "declaration": 6,
+    "references": 6,
+}
+PREAMBLE_PRIORITY = 1
+
+_BULLET_RE = re.compile(r"^\s*(?:[•●▪◦‣⁃∙·■□➢✓✔*\-–—>])\s*")
+_SPACE_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+_HYPHEN_BREAK_RE = re.compile(r"([A-Za-z])-\n([a-z])")
+_DIGITS_RE = re.compile(r"\d+")
+_PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?\d+(?:\s*(?:/|of)\s*\d+)?$", re.IGNORECASE)
+_HEADING_STRIP_RE = re.compile(r"[^a-z ]")
+
+# Lines within this many lines of a page's top or bottom can be headers/footers
+_EDGE_LINES = 3
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    original_chars: int
+    compacted_chars: int
+    truncated: bool
+
+    @property
+    def original_tokens(self):
+        return estimate_tokens_for_chars(self.original_chars)
+
+    @property
+    def compacted_tokens(self):
+        return estimate_tokens_for_chars(self.compacted_chars)
+
+    @property
+    def reduction(self):
+        """Fraction of the input removed, 0.0-1.0."""
+        if not self.original_chars:
+            return 0.0
+        return 1 - self.compacted_chars / self.original_chars
+
+
+def estimate_tokens_for_chars(chars):
+    return (chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _edge_key(line):
+    # "Page 2 of 3" and "Page 3 of 3" should count as the same footer
+    return _DIGITS_RE.sub("#", line.strip().lower())
+
+
+def _strip_repeated_edges(pages):
+    """Remove lines that appear near the top/bottom of most pages."""
+    if len(pages) < 2:
+        return pages
+    counts = Counter()
+    for lines in pages:
+        edges = lines[:_EDGE_LINES] + lines[-_EDGE_LINES:]
+        counts.update({_edge_key(line) for line in edges if line.strip()})
+    threshold = max(2, (len(pages) + 1) // 2)
+    repeated = {key for key, count in counts.items() if count >= threshold}
+
+    cleaned = []
+    for lines in pages:
+        keep = []
+        last = len(lines) - 1
+        for i, line in enumerate(lines):
+            near_edge = i < _EDGE_LINES or last - i < _EDGE_LINES
+            if near_edge and _edge_key(line) in repeated:
+                continue
+            keep.append(line)
+        cleaned.append(keep)
+    return cleaned
+
+
+def _normalize_line(line):
+    line = _SPACE_RE.sub(" ", line).strip()
+    if not line:
+        return ""
+    bullet = _BULLET_RE.match(line)
+    if bullet and bullet.end() < len(line):
+        line = "- " + line[bullet.end():]
+    return line
+
+
+def _heading_priority(line):
+    if len(line) > 40 or line.startswith("- "):
+        return None
+    key = _HEADING_STRIP_RE.sub("", line.lower()).strip()
+    key = " ".join(key.split())
+    return SECTION_PRIORITIES.get(key)
+
+
+def _split_sections(lines):
+    """[(priority, [lines])] in document order."""
+    sections = [(PREAMBLE_PRIORITY, [])]
+    for line in lines:
+        priority = _heading_priority(line)
+        if priority is not None:
+            sections.append((priority, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(p, ls) for p, ls in sections if ls]
+
+
+def _cap_sections(sections, max_chars):
+    """Keep whole sections by priority, then trim the first that doesn't fit."""
+    kept = [None] * len(sections)
+    remaining = max_chars
+    truncated = False
+    order = sorted(range(len(sections)), key=lambda i: (sections[i][0], i))
+    for i in order:
+        lines = sections[i][1]
+        size = sum(len(line) + 1 for line in lines)
+        if size <= remaining:
+            kept[i] = lines
+            remaining -= size
+            continue
+        truncated = True
+        partial = []
+        used = 0
+        for line in lines:
+            if used + len(line) + 1 > remaining:
+                break
+            partial.append(line)
+            used += len(line) + 1
+        if len(partial) > 1:  # more than just the heading
+            kept[i] = partial
+            remaining -= used
+    return [lines for lines in kept if lines], truncated
+
+
+def compact_text(text, token_budget=None):
+    """Compact extracted resume text; returns a CompactionResult."""
+    if token_budget is None:
+        token_budget = getattr(settings, "AI_PROMPT_TOKEN_BUDGET", 3000)
+    original_chars = len(text)
+
+    text = _HYPHEN_BREAK_RE.sub(r"\1-\2", text.replace("\r\n", "\n"))
+    pages = [page.split("\n") for page in text.split(PAGE_BREAK)]
+    pages = _strip_repeated_edges(pages)
+
+    lines = []
+    for page in pages:
+        for line in page:
+            line = _normalize_line(line)
+            if line and not _PAGE_NUMBER_RE.match(line):
+                lines.append(line)
+
+    truncated = False
+    max_chars = token_budget * CHARS_PER_TOKEN
+    if sum(len(line) + 1 for line in lines) > max_chars:
+        kept, truncated = _cap_sections(_split_sections(lines), max_chars)
+        lines = [line for section in kept for line in section]
+
+    compacted = "\n".join(lines)
+    return CompactionResult(
+        text=compacted,
+        original_chars=original_chars,
+        compacted_chars=len(compacted),
+        truncated=truncated,
+    )
@@ -0,0 +1,119 @@
+"""
+Memory-bounded ingestion of uploaded resume PDFs.
+
+- ``PDFSizeLimitUploadHandler`` sits in front of Django's upload handlers and
+  enforces ``PDF_UPLOAD_MAX_BYTES`` while the request body is streamed, so an
+  oversized PDF is dropped before it is buffered or parsed.
+- Uploads above ``FILE_UPLOAD_MAX_MEMORY_SIZE`` are spooled to a temporary
+  file by Django's own ``TemporaryFileUploadHandler``.
+- ``ingest_pdf`` checks the ``%PDF-`` magic bytes, hashes the file in chunks
+  and exposes it for parsing: the temp file's path when it was spooled to
+  disk (the extraction worker memory-maps it), the raw bytes otherwise.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.template.defaultfilters import filesizeformat
+
+PDF_MAGIC = b"%PDF-"
+# The PDF spec allows junk before the header; readers accept it in the first 1 KB.
+MAGIC_WINDOW = 1024
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+class UploadRejected(Exception):
+    """The upload is missing, too large or not a PDF. The message is user-facing."""
+
+
+def _max_bytes():
+    return getattr(settings, "PDF_UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+
+
+def _too_large_message():
+    return "PDF is too large. The maximum size is %s." % filesizeformat(_max_bytes())
+
+
+def _pdf_fields():
+    return getattr(settings, "PDF_UPLOAD_FIELDS", ("resume_pdf",))
+
+
+class PDFSizeLimitUploadHandler(FileUploadHandler):
+    """
+    Drop a PDF upload as soon as more than ``PDF_UPLOAD_MAX_BYTES`` have been
+    received. The rejected field name is recorded on
+    ``request.rejected_uploads`` so the view can explain why.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.received = 0
+        self.limited = field_name in _pdf_fields()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.limited:
+            self.received += len(raw_data)
+            if self.received > _max_bytes():
+                rejected = getattr(self.request, "rejected_uploads", {})
+                rejected[self.field_name] = "too_large"
+                self.request.rejected_uploads = rejected
+                raise SkipFile()
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Let the next handler (memory or temp file) build the UploadedFile.
+        return None
+
+
+class IngestedPDF:
+    def __init__(self, uploaded, sha256, size):
+        self.uploaded = uploaded
+        self.name = uploaded.name
+        self.sha256 = sha256
+        self.size = size
+
+    @property
+    def path(self):
+        """Path of the spooled temp file, or None for small in-memory uploads."""
+        temporary_file_path = getattr(self.uploaded, "temporary_file_path", None)
+        return temporary_file_path() if temporary_file_path else None
+
+    @property
+    def source(self):
+        """What to hand to the extraction service: a file path or bytes."""
+        path = self.path
+        if path:
+            return path
+        self.uploaded.seek(0)
+        return self.uploaded.read()
+
+
+def ingest_pdf(request, field_name="resume_pdf"):
+    """
+    Validate and hash the PDF uploaded in ``field_name``.
+    Returns an ``IngestedPDF`` or raises ``UploadRejected``.
+    """
+    # Accessing FILES parses the body, which runs the upload handlers.
+    uploaded = request.FILES.get(field_name)
+    if getattr(request, "rejected_uploads", {}).get(field_name) == "too_large":
+        raise UploadRejected(_too_large_message())
+    if not uploaded:
+        raise UploadRejected("Please upload a PDF file.")
+    if not uploaded.name.lower().endswith(".pdf"):
+        raise UploadRejected("Only PDF files are supported.")
+    if uploaded.size > _max_bytes():
+        # Handler not installed (e.g. custom FILE_UPLOAD_HANDLERS); still refuse.
+        raise UploadRejected(_too_large_message())
+
+    uploaded.seek(0)
+    head = uploaded.read(MAGIC_WINDOW)
+    if PDF_MAGIC not in head:
+        raise UploadRejected("This file is not a valid PDF.")
+
+    uploaded.seek(0)
+    digest = hashlib.sha256()
+    for chunk in uploaded.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    uploaded.seek(0)
+
+    return IngestedPDF(uploaded, digest.hexdigest(), uploaded.size)
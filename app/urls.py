@@ -6,10 +6,19 @@ from .views import (
     resume_preview,
     select_template,
     resume_pdf,
+    resume_pdf_render,
+    render_job_status,
+    export_resumes,
     templates_view,
     ai_resume_analysis,
+    ai_analysis_status,
+    ai_analysis_events,
+    ai_analysis_live,
     ai_analysis_results,
+    ai_analysis_history,
     profile,
+    resume_list_page,
+    readiness,
 )
 urlpatterns = [
     path("dashboard/", dashboard, name="dashboard"),
@@ -28,7 +37,21 @@ urlpatterns = [
         resume_pdf,
         name="resume_pdf",
     ),
+    path(
+        "resume/<int:resume_id>/pdf/<str:template>/render/",
+        resume_pdf_render,
+        name="resume_pdf_render",
+    ),
+    path("resumes/page/", resume_list_page, name="resume_list_page"),
+    path("resumes/export/", export_resumes, name="export_resumes"),
+    path("render-jobs/<int:job_id>/", render_job_status, name="render_job_status"),
     path("ai/analyze-resume/", ai_resume_analysis, name="ai_resume_analysis"),
+    path("ai/analysis-jobs/<int:job_id>/", ai_analysis_status, name="ai_analysis_status"),
+    path("ai/analysis-jobs/<int:job_id>/events/", ai_analysis_events, name="ai_analysis_events"),
+    path("ai/analysis-jobs/<int:job_id>/live/", ai_analysis_live, name="ai_analysis_live"),
     path("ai/analysis-results/", ai_analysis_results, name="ai_analysis_results"),
+    path("ai/analysis-results/<int:analysis_id>/", ai_analysis_results, name="ai_analysis_result"),
+    path("ai/analyses/", ai_analysis_history, name="ai_analysis_history"),
+    path("ready/", readiness, name="readiness"),
 
 ]
@@ -1,188 +1,118 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.decorators import login_required
-from django.db.models import Avg, Max
-from django.http import HttpResponse, JsonResponse
+import os
+
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.urls import reverse
 from django.template.loader import render_to_string
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.conf import settings
-from io import BytesIO
-from datetime import datetime
-import re
-import json
 
-from pypdf import PdfReader
-from xhtml2pdf import pisa
-
-try:
-    import google.generativeai as genai
-    GENAI_AVAILABLE = True
-except ImportError:
-    GENAI_AVAILABLE = False
-
-from .models import Resume, ResumeTemplate
+from .models import AIAnalysisJob, AnalysisResult, PDFRenderJob, Resume, ResumeTemplate
 from .forms import ResumeForm
+from .ai_analysis import STUDY_PLAN_SECTIONS, enqueue_analysis, expire_stale_job, stream_job_events
+from .ai_providers import get_provider
+from .ats import score_text
+from .bulk_export import stream_resumes_zip
+from .conditional import gallery_etag, not_modified, resume_validators, set_validators
+from .documents import DocumentError, get_or_create_document, get_user_document
+from .uploads import UploadRejected, ingest_pdf
+from .media_serving import can_view_media, media_response
+from .pdf_cache import get_pdf_cache
+from .pdf_render import PDFRenderError, render_resume_pdf, resume_pdf_key
+from .photo_storage import get_photo_storage
+from .preview_cache import get_preview_cache
+from .render_queue import enqueue_render
+from .resume_listing import InvalidCursor, resume_page
+from .resume_stats import get_resume_stats
+from .resume_context import RESUME_TEMPLATES
+from .warmup import is_ready, warmup_state
 
 
 def _calculate_ats_score_from_text(text: str) -> int:
     """
-    Very simple ATS score heuristic based on sections, keywords and length.
-    Returns an integer between 0 and 100.
+    ATS score heuristic based on sections, keywords and length.
+    Returns an integer between 0 and 100. The scoring engine and its
+    dictionaries live in app/ats.py and app/data/ats_dictionaries.json.
     """
-    if not text:
-        return 0
-
-    text_lower = text.lower()
-    score = 0.0
-
-    # 1) Check for common resume sections (40% of score)
-    sections = [
-        "summary",
-        "objective",
-        "career objective",
-        "education",
-        "experience",
-        "work history",
-        "projects",
-        "skills",
-        "certifications",
-    ]
-    section_weight = 40.0
-    per_section = section_weight / len(sections)
-    for s in sections:
-        if s in text_lower:
-            score += per_section
-
-    # 2) Check for common keywords (40% of score)
-    keywords = [
-        "python",
-        "django",
-        "sql",
-        "rest api",
-        "html",
-        "css",
-        "javascript",
-        "react",
-        "machine learning",
-        "data analysis",
-        "git",
-        "docker",
-    ]
-    keyword_weight = 40.0
-    per_kw = keyword_weight / len(keywords)
-    found_keywords = 0
-    for kw in keywords:
-        if kw in text_lower:
-            found_keywords += 1
-    score += min(found_keywords * per_kw, keyword_weight)
-
-    # 3) Length / readability (20% of score)
-    words = re.findall(r"\w+", text_lower)
-    word_count = len(words)
-    if 300 <= word_count <= 1200:
-        score += 20.0
-    elif 150 <= word_count < 300 or 1200 < word_count <= 2000:
-        score += 10.0
-
-    # Clamp between 0 and 100
-    return int(max(0, min(100, round(score))))
-
-
-def _split_lines(text: str):
-    if not text:
-        return []
-    return [line.strip() for line in text.splitlines() if line.strip()]
-
-
-def _split_name(full_name: str):
-    """Split full name into first and last name parts."""
-    if not full_name:
-        return ["", ""]
-    parts = full_name.strip().split()
-    if len(parts) == 0:
-        return ["", ""]
-    elif len(parts) == 1:
-        return [parts[0], ""]
-    else:
-        return [parts[0], " ".join(parts[1:])]
-
-
-def _parse_education(resume: Resume):
-    quals = _split_lines(resume.edu_qualification)
-    years = resume.edu_year.splitlines() if resume.edu_year else []
-    colleges = resume.edu_college.splitlines() if resume.edu_college else []
-    universities = resume.edu_university.splitlines() if resume.edu_university else []
-    cgpas = resume.edu_cgpa.splitlines() if resume.edu_cgpa else []
-    classes = resume.edu_class.splitlines() if resume.edu_class else []
-
-    rows = []
-    for idx, qual in enumerate(quals):
-        rows.append({
-            "qualification": qual,
-            "year": years[idx] if idx < len(years) else "",
-            "college": colleges[idx] if idx < len(colleges) else "",
-            "university": universities[idx] if idx < len(universities) else "",
-            "cgpa": cgpas[idx] if idx < len(cgpas) else "",
-            "class": classes[idx] if idx < len(classes) else "",
-        })
-    return rows
+    return score_text(text).score
 
 
 def home(request):
     return render(request, "index.html")
 
 
+def serve_media(request, path):
+    """
+    Uploaded media for its owner (see app/media_serving.py). Anything the
+    user may not see is a 404, so file names don't leak.
+    """
+    if not can_view_media(request.user, path):
+        raise Http404
+    try:
+        file_path = get_photo_storage().path(path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(file_path):
+        raise Http404
+    return media_response(request, path, file_path)
+
+
+def readiness(request):
+    """Load balancer readiness probe: 503 until the startup warm-up has finished."""
+    state = warmup_state()
+    ready = is_ready()
+    return JsonResponse({
+        "ready": ready,
+        "warmup": state["status"],
+        "timings": {step: round(seconds, 3) for step, seconds in state["timings"].items()},
+        "error": state["error"],
+    }, status=200 if ready else 503)
+
+
 @login_required(login_url="/register/")
 def dashboard(request):
     print("DEBUG: dashboard accessed by", request.user)
 
-    resumes = Resume.objects.filter(user=request.user)
-
-    total_resumes = resumes.count()
-    analyzed_count = resumes.filter(analyzed=True).count()
-
-    avg_ats = resumes.aggregate(avg=Avg("ats_score"))["avg"] or 0
-    last_updated = resumes.aggregate(last=Max("updated_at"))["last"]
+    # One row (or one aggregate query); see app/resume_stats.py
+    stats = get_resume_stats(request.user)
 
     ats_score_result = None
     ats_error = None
+    uploaded_document = None
 
     # Handle ATS score calculation from uploaded PDF
     if request.method == "POST":
-        uploaded = request.FILES.get("resume_pdf")
-        if not uploaded:
-            ats_error = "Please upload a PDF file."
-        elif not uploaded.name.lower().endswith(".pdf"):
-            ats_error = "Only PDF files are supported."
-        else:
-            try:
-                reader = PdfReader(uploaded)
-                text_parts = []
-                for page in reader.pages:
-                    page_text = page.extract_text() or ""
-                    text_parts.append(page_text)
-                full_text = "\n".join(text_parts).strip()
-                if not full_text:
-                    ats_error = "Could not read any text from the PDF. Make sure it is not just an image."
-                else:
-                    ats_score_result = _calculate_ats_score_from_text(full_text)
-            except Exception as e:
-                ats_error = "Error reading PDF file. Please try another file."
+        try:
+            ingested = ingest_pdf(request)
+            uploaded_document, _ = get_or_create_document(ingested, request.user)
+            if not uploaded_document.text:
+                ats_error = "Could not read any text from the PDF. Make sure it is not just an image."
+            else:
+                ats_score_result = uploaded_document.ats_score
+        except (UploadRejected, DocumentError) as e:
+            ats_error = str(e)
 
     context = {
-        "total_resumes": total_resumes,
-        "avg_ats": round(avg_ats),
-        "analyzed_count": analyzed_count,
-        "last_updated": last_updated,
-        "resumes": resumes,
+        "total_resumes": stats["total_resumes"],
+        "avg_ats": round(stats["avg_ats"]),
+        "analyzed_count": stats["analyzed_count"],
+        "last_updated": stats["last_updated"],
         "ats_score_result": ats_score_result,
         "ats_error": ats_error,
+        "uploaded_document": uploaded_document,
     }
 
     return render(request, "dashboard.html", context)
 
 
 def templates_view(request):
+    etag = gallery_etag(request.user)
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
     templates = ResumeTemplate.objects.all()
-    return render(request, "templates.html", {"templates": templates})
+    return set_validators(render(request, "templates.html", {"templates": templates}), etag)
 
 
 @login_required
@@ -231,35 +161,19 @@ def select_template(request, resume_id):
 def resume_preview(request, resume_id, template):
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
 
-    allowed_templates = [
-        "professional_classic",
-        "creative_minimal",
-        "modern_photo_style",
-    ]
-
-    if template not in allowed_templates:
+    if template not in RESUME_TEMPLATES:
         return redirect("select_template", resume_id=resume.id)
 
-    education_rows = _parse_education(resume)
-    name_parts = _split_name(resume.full_name)
-
-    return render(
-        request,
-        f"resume/{template}.html",
-        {
-            "r": resume,
-            "template_slug": template,
-            "education_rows": education_rows,
-            "skills_list": _split_lines(resume.skills),
-            "projects_list": _split_lines(resume.projects),
-            "achievements_list": _split_lines(resume.achievements),
-            "certifications_list": _split_lines(resume.certifications),
-            "languages_list": _split_lines(resume.languages),
-            "hobbies_list": _split_lines(resume.hobbies),
-            "first_name": name_parts[0],
-            "last_name": name_parts[1],
-        },
-    )
+    # A browser revalidating an unchanged preview gets a 304 (app/conditional.py)
+    etag, last_modified = resume_validators(resume, template, "preview")
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged is not None:
+        return unchanged
+
+    html, hit = get_preview_cache().get_or_render(resume, template)
+    response = HttpResponse(html)
+    response["X-Cache"] = "hit" if hit else "miss"
+    return set_validators(response, etag, last_modified)
 
 
 @login_required
@@ -270,327 +184,307 @@ def resume_pdf(request, resume_id, template):
     """
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
 
-    allowed_templates = [
-        "professional_classic",
-        "creative_minimal",
-        "modern_photo_style",
-    ]
-
-    if template not in allowed_templates:
+    if template not in RESUME_TEMPLATES:
         return redirect("select_template", resume_id=resume.id)
 
-    education_rows = _parse_education(resume)
-    name_parts = _split_name(resume.full_name)
-
-    # Render HTML from the chosen template
-    html_string = render_to_string(
-        f"resume/{template}.html",
-        {
-            "r": resume,
-            "template_slug": template,
-            "education_rows": education_rows,
-            "skills_list": _split_lines(resume.skills),
-            "projects_list": _split_lines(resume.projects),
-            "achievements_list": _split_lines(resume.achievements),
-            "certifications_list": _split_lines(resume.certifications),
-            "languages_list": _split_lines(resume.languages),
-            "hobbies_list": _split_lines(resume.hobbies),
-            "first_name": name_parts[0],
-            "last_name": name_parts[1],
-        },
+    filename = f"resume_{resume_id}.pdf"
+
+    etag, last_modified = resume_validators(resume, template, "pdf")
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged is not None:
+        return unchanged
+
+    # Serve from the PDF artifact cache when this resume/template has not
+    # changed since the last render (see app/pdf_cache.py).
+    pdf_cache = get_pdf_cache()
+    cache_key = resume_pdf_key(resume, template)
+    cached = pdf_cache.open(cache_key)
+    if cached is not None:
+        response = FileResponse(cached, as_attachment=True, filename=filename, content_type="application/pdf")
+        response["X-Cache"] = "hit"
+        return set_validators(response, etag, last_modified)
+
+    # Optional asynchronous mode: hand the render to `manage.py render_worker`
+    # and show a page that polls for it instead of blocking this worker.
+    if getattr(settings, "PDF_RENDER_ASYNC", False):
+        job = enqueue_render(resume, template, request.user)
+        return render(request, "pdf_render_pending.html", {
+            "resume": resume,
+            "job": job,
+            "status_url": reverse("render_job_status", args=[job.id]),
+        }, status=202)
+
+    try:
+        pdf_bytes = render_resume_pdf(resume, template)
+    except PDFRenderError:
+        return HttpResponse("Error generating PDF", status=500)
+
+    pdf_cache.put(cache_key, pdf_bytes)
+
+    response = HttpResponse(pdf_bytes, content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["X-Cache"] = "miss"
+    return set_validators(response, etag, last_modified)
+
+
+@login_required
+def export_resumes(request):
+    """
+    Download all of the user's resumes in every template as one ZIP,
+    streamed while the PDFs are rendered on the render pool.
+    """
+    resumes = Resume.objects.filter(user=request.user).order_by("created_at")
+    response = StreamingHttpResponse(
+        stream_resumes_zip(resumes, RESUME_TEMPLATES),
+        content_type="application/zip",
     )
+    response["Content-Disposition"] = 'attachment; filename="resumes.zip"'
+    return response
+
+
+def _render_job_payload(job):
+    data = {
+        "job_id": job.id,
+        "status": job.status,
+        "progress": job.progress,
+        "status_url": reverse("render_job_status", args=[job.id]),
+    }
+    if job.status == PDFRenderJob.DONE:
+        # The finished PDF sits in the artifact cache, so this is a cache hit
+        data["download_url"] = reverse("resume_pdf", args=[job.resume_id, job.template_slug])
+    elif job.status == PDFRenderJob.FAILED:
+        data["error"] = job.error or "Error generating PDF"
+    return data
 
-    # Compact CSS to stay within 1–2 pages
-    html = f"""
-    <style>
-        @page {{ size: A4; margin: 14mm; }}
-        body {{ font-family: Arial, sans-serif; font-size: 11pt; line-height: 1.35; }}
-        h1 {{ font-size: 20pt; margin: 0 0 6px 0; }}
-        h2 {{ font-size: 13pt; margin: 12px 0 6px 0; }}
-        p, li {{ font-size: 11pt; margin: 0 0 4px 0; }}
-        .section, div {{ page-break-inside: avoid; }}
-    </style>
-    {html_string}
+
+@login_required
+def resume_pdf_render(request, resume_id, template):
+    """
+    Queue a background render of a resume PDF and return the job status.
     """
+    if request.method != "POST":
+        return JsonResponse({"error": "Only POST requests allowed"}, status=405)
 
-    result = BytesIO()
-    pdf = pisa.CreatePDF(html, dest=result, link_callback=None)
+    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    if template not in RESUME_TEMPLATES:
+        return JsonResponse({"error": "Unknown template"}, status=404)
 
-    if pdf.err:
-        return HttpResponse("Error generating PDF", status=500)
+    job = enqueue_render(resume, template, request.user)
+    return JsonResponse(_render_job_payload(job), status=202)
 
-    response = HttpResponse(result.getvalue(), content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="resume_{resume_id}.pdf"'
-    return response
+
+@login_required
+def render_job_status(request, job_id):
+    job = get_object_or_404(PDFRenderJob, id=job_id, user=request.user)
+    return JsonResponse(_render_job_payload(job))
 
 
 @login_required
 def ai_resume_analysis(request):
     """
     AI-powered resume analysis using Google Generative AI.
-    Accepts PDF from user, reads it, converts to string, and analyzes using Gemini API.
+    Accepts PDF from user, reads it, converts to string, and queues a Gemini
+    analysis job. Returns the job id, a status URL to poll and, with
+    AI_STREAM_ENABLED, a live page that streams the results as they are
+    generated.
     """
     if request.method != "POST":
         return JsonResponse({"error": "Only POST requests allowed"}, status=405)
 
-    if not GENAI_AVAILABLE:
-        return JsonResponse({"error": "Google Generative AI library not installed. Run: pip install google-generativeai"}, status=500)
+    # Sessions from before results moved to the database still carry them
+    request.session.pop('ai_analysis', None)
+
+    provider_error = get_provider().configuration_error()
+    if provider_error:
+        return JsonResponse({"error": provider_error}, status=500)
+
+    # Step 1: Accept PDF from user, or a previously uploaded document by id
+    document_id = request.POST.get("document_id")
+    if document_id:
+        if not document_id.isdigit():
+            return JsonResponse({"error": "Invalid document id."}, status=400)
+        document = get_user_document(request.user, document_id)
+        if document is None:
+            return JsonResponse({"error": "Document not found. Please upload the PDF again."}, status=404)
+
+    # Steps 2-3: Read PDF using pypdf and convert to string
+    # (a repeat upload of the same file is served from the document store)
+    if not document_id:
+        try:
+            ingested = ingest_pdf(request)
+            document, _ = get_or_create_document(ingested, request.user)
+        except (UploadRejected, DocumentError) as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+    if not document.text:
+        return JsonResponse({
+            "error": "Could not read any text from the PDF. Make sure it is not just an image or scanned document."
+        }, status=400)
+
+    # Steps 4-6 (Gemini call) run in the background; the dashboard polls the job
+    job = enqueue_analysis(request.user, document)
+    return JsonResponse(_analysis_job_payload(job), status=202)
+
+
+def _analysis_job_payload(job):
+    payload = {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": reverse("ai_analysis_status", args=[job.id]),
+        "queued_seconds": job.queued_seconds,
+        "run_seconds": job.run_seconds,
+        "cache_hit": job.cache_hit,
+        "input_chars": job.input_chars,
+        "prompt_chars": job.prompt_chars,
+    }
+    if getattr(settings, "AI_STREAM_ENABLED", False):
+        payload["events_url"] = reverse("ai_analysis_events", args=[job.id])
+        payload["live_url"] = reverse("ai_analysis_live", args=[job.id])
+    if job.status == AIAnalysisJob.FAILED:
+        payload["error"] = job.error
+    if job.status == AIAnalysisJob.DONE and job.analysis_id:
+        payload["redirect_url"] = reverse("ai_analysis_result", args=[job.analysis_id])
+    return payload
 
-    api_key = getattr(settings, "GOOGLE_AI_API_KEY", None)
-    if not api_key or api_key == "YOUR_GOOGLE_AI_API_KEY_HERE":
-        return JsonResponse({"error": "Google AI API key not configured. Please set GOOGLE_AI_API_KEY in settings.py"}, status=500)
 
-    # Step 1: Accept PDF from user
-    uploaded = request.FILES.get("resume_pdf")
-    if not uploaded:
-        return JsonResponse({"error": "Please upload a PDF file."}, status=400)
+@login_required
+def ai_analysis_status(request, job_id):
+    """Polled by the dashboard until the analysis job is done or failed."""
+    job = get_object_or_404(AIAnalysisJob, id=job_id, user=request.user)
+    expire_stale_job(job)
+    payload = _analysis_job_payload(job)
+    if job.status == AIAnalysisJob.DONE:
+        # Keep only the id in the session; the result itself is in the database
+        request.session['ai_analysis_id'] = job.analysis_id
+        payload["success"] = True
+    return JsonResponse(payload)
 
-    if not uploaded.name.lower().endswith(".pdf"):
-        return JsonResponse({"error": "Only PDF files are supported."}, status=400)
 
-    try:
-        # Step 2: Read PDF using pypdf and convert to string
-        # Reset file pointer to beginning in case it was read before
-        uploaded.seek(0)
-        
-        # Read PDF file
-        reader = PdfReader(uploaded)
-        
-        # Extract text from all pages
-        text_parts = []
-        for page_num, page in enumerate(reader.pages, start=1):
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-            except Exception as page_err:
-                # Continue with other pages if one fails
-                continue
-        
-        # Step 3: Convert PDF content to string
-        resume_text = "\n".join(text_parts).strip()
-        
-        if not resume_text:
-            return JsonResponse({
-                "error": "Could not read any text from the PDF. Make sure it is not just an image or scanned document."
-            }, status=400)
-
-        # Step 4: Configure Gemini API
-        genai.configure(api_key=api_key)
-        
-        # Test API connection by trying to list available models (optional, for debugging)
-        available_model_hint = None
-        try:
-            # Try to get a list of available models (this helps with debugging)
-            models_list = list(genai.list_models())
-            if models_list:
-                # Extract model names that support generateContent
-                working_models = []
-                for m in models_list:
-                    if hasattr(m, 'supported_generation_methods') and 'generateContent' in m.supported_generation_methods:
-                        model_name = m.name.replace('models/', '') if hasattr(m, 'name') else str(m)
-                        working_models.append(model_name)
-                if working_models:
-                    available_model_hint = working_models[0]  # Use first available model
-        except Exception:
-            # If listing fails, continue with default models
-            pass
-        
-        # Step 5: Create prompt with the resume text string
-        prompt = f"""Analyze the following resume and provide detailed career recommendations in JSON format.
-
-Resume Content:
-{resume_text}
-
-Please provide a JSON response with the following structure:
-{{
-    "top_companies": [
-        {{
-            "name": "Company Name",
-            "location": "City, State/Country",
-            "match_reason": "Why this company matches the candidate",
-            "hiring_process": "Step-by-step hiring process (interview rounds, tests, etc.)",
-            "study_resources": ["Resource 1", "Resource 2", "Resource 3"]
-        }}
-    ],
-    "study_plan": {{
-        "overview": "Overall study plan description for the candidate",
-        "timeline": "Suggested timeline (e.g., 3 months, 6 months)",
-        "weekly_schedule": [
-            {{
-                "day": "Monday",
-                "topics": ["Topic 1", "Topic 2"],
-                "hours": 2,
-                "activities": "Description of activities"
-            }}
-        ],
-        "skill_gaps": ["Skill 1 to improve", "Skill 2 to learn"],
-        "recommended_courses": [
-            {{
-                "name": "Course Name",
-                "platform": "Platform (Coursera, Udemy, etc.)",
-                "duration": "Duration",
-                "description": "Why this course is recommended"
-            }}
-        ],
-        "practice_projects": [
-            {{
-                "title": "Project Title",
-                "description": "Project description",
-                "technologies": ["Tech 1", "Tech 2"],
-                "difficulty": "Beginner/Intermediate/Advanced"
-            }}
-        ],
-        "certifications": [
-            {{
-                "name": "Certification Name",
-                "issuer": "Issuing Organization",
-                "importance": "Why this certification matters"
-            }}
-        ]
-    }}
-}}
-
-Provide exactly 10 companies that would be a good fit based on the candidate's skills, experience, and qualifications. Include:
-- Real companies that actually hire for these roles
-- Specific locations (cities)
-- Detailed hiring processes (e.g., "1. Online Application 2. Phone Screen 3. Technical Assessment 4. On-site Interview 5. HR Round")
-- Practical study resources (courses, books, websites, certifications)
-
-Create a comprehensive study plan that includes:
-- Weekly schedule with specific topics and activities
-- Skill gaps to address
-- Recommended courses with platforms and durations
-- Practice projects to build portfolio
-- Important certifications to pursue
-
-Return ONLY valid JSON, no additional text."""
-
-        # Step 6: Use Gemini API to analyze - try available models
-        # Updated model names (as of 2024) - try most common working models
-        # Try models in order of preference: fastest/cheapest first
-        model_names = [
-            'gemini-1.5-flash',      # Fast and efficient (most commonly available)
-            'gemini-1.5-pro',        # More capable
-        ]
-        
-        # If we found an available model from listing, try it first
-        if available_model_hint and available_model_hint not in model_names:
-            model_names.insert(0, available_model_hint)
-        
-        response = None
-        last_error = None
-        successful_model = None
-        
-        for model_name in model_names:
-            try:
-                # Create model instance
-                model = genai.GenerativeModel(model_name)
-                
-                # Generate response using Gemini API with the resume text string
-                response = model.generate_content(prompt)
-                
-                # Check if response has text
-                if hasattr(response, 'text') and response.text:
-                    successful_model = model_name
-                    break  # Success, exit loop
-                else:
-                    raise Exception("Empty response from model")
-                    
-            except Exception as e:
-                error_str = str(e)
-                last_error = error_str
-                # Continue to try next model
-                continue
-        
-        if response is None or not hasattr(response, 'text') or not response.text:
-            # Provide helpful error message
-            error_msg = f"Failed to generate response from Gemini API.\n"
-            error_msg += f"Tried models: {', '.join(model_names)}\n"
-            error_msg += f"Last error: {last_error}\n\n"
-            error_msg += "Please check:\n"
-            error_msg += "1. Your API key is valid and has access to Gemini models\n"
-            error_msg += "2. Your API key has not exceeded quota\n"
-            error_msg += "3. The model names are correct for your API version"
-            raise Exception(error_msg)
-        
-        response_text = response.text.strip()
-
-        # Clean up response (remove markdown code blocks if present)
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        # Parse JSON response
-        try:
-            ai_data = json.loads(response_text)
-        except json.JSONDecodeError as json_err:
-            # If JSON parsing fails, return raw response for debugging
-            return JsonResponse({
-                "error": "AI response parsing failed",
-                "raw_response": response_text[:1000],
-                "json_error": str(json_err),
-                "resume_text_preview": resume_text[:200]  # Show first 200 chars for debugging
-            }, status=500)
-
-        # Store analysis in session and redirect to results page
-        request.session['ai_analysis'] = ai_data
-        request.session['analysis_timestamp'] = str(datetime.now())
-        
-        return JsonResponse({
-            "success": True,
-            "redirect_url": "/ai/analysis-results/"
-        })
+def _render_analysis_item(kind, key, value):
+    if kind == "company":
+        return render_to_string("ai_analysis/company_card.html", {"company": value, "number": key + 1})
+    return render_to_string("ai_analysis/study_plan_section.html", {"key": key, "value": value})
+
+
+@login_required
+async def ai_analysis_events(request, job_id):
+    """
+    Server-Sent Events for an analysis job: each company and study-plan
+    section is pushed as rendered HTML as soon as the model has finished it.
+    Async, so an open stream doesn't hold a worker when served under ASGI;
+    only offered when AI_STREAM_ENABLED is set.
+    """
+    if not getattr(settings, "AI_STREAM_ENABLED", False):
+        raise Http404
+    user = await request.auser()
+    job = await aget_object_or_404(AIAnalysisJob, id=job_id, user=user)
+    if job.status == AIAnalysisJob.DONE:
+        await request.session.aset('ai_analysis_id', job.analysis_id)
+    response = StreamingHttpResponse(
+        stream_job_events(job, _render_analysis_item, _analysis_job_payload),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
 
-    except Exception as e:
-        import traceback
-        error_details = {
-            "error": f"Error processing resume: {str(e)}",
-        }
-        if settings.DEBUG:
-            error_details["traceback"] = traceback.format_exc()
-        return JsonResponse(error_details, status=500)
+@login_required
+def ai_analysis_live(request, job_id):
+    """
+    Results page that fills in while the analysis is generated.
+    """
+    job = get_object_or_404(AIAnalysisJob, id=job_id, user=request.user)
+    if job.status == AIAnalysisJob.DONE and job.analysis_id:
+        request.session['ai_analysis_id'] = job.analysis_id
+        return redirect('ai_analysis_result', analysis_id=job.analysis_id)
+    context = {
+        'live_job': job,
+        'job_payload': _analysis_job_payload(job),
+        'study_plan_sections': STUDY_PLAN_SECTIONS,
+    }
+    return render(request, 'ai_analysis_results.html', context)
 
 
 @login_required
 def profile(request):
     """
-    Display user profile with all their resumes.
+    Display user profile with the first page of their resumes; further
+    pages come from resume_list_page as the user scrolls.
     """
-    resumes = Resume.objects.filter(user=request.user).order_by('-created_at')
-    
+    try:
+        resumes, next_cursor = resume_page(request.user, request.GET.get("cursor"))
+    except InvalidCursor:
+        return redirect("profile")
+
     context = {
         'user': request.user,
         'resumes': resumes,
-        'total_resumes': resumes.count(),
+        'total_resumes': get_resume_stats(request.user)["total_resumes"],
+        'next_cursor': next_cursor,
     }
-    
+
     return render(request, 'profile.html', context)
 
 
 @login_required
-def ai_analysis_results(request):
+def resume_list_page(request):
+    """Next page of resume cards for infinite scroll on the profile page."""
+    try:
+        page_size = int(request.GET.get("limit", 0)) or None
+        resumes, next_cursor = resume_page(request.user, request.GET.get("cursor"), page_size)
+    except (InvalidCursor, ValueError):
+        return JsonResponse({"error": "Invalid cursor or limit."}, status=400)
+
+    html = "".join(
+        render_to_string("profile/resume_card.html", {"resume": resume}) for resume in resumes
+    )
+    return JsonResponse({
+        "html": html,
+        "count": len(resumes),
+        "next_cursor": next_cursor,
+        "next_url": f"{reverse('resume_list_page')}?cursor={next_cursor}" if next_cursor else None,
+    })
+
+
+@login_required
+def ai_analysis_results(request, analysis_id=None):
     """
     Display the AI resume analysis results on a user-friendly page.
+    Without an id, shows the latest analysis from this session.
     """
-    # Get analysis from session
-    ai_data = request.session.get('ai_analysis')
-    
-    if not ai_data:
-        # If no analysis in session, redirect to dashboard
-        return redirect('dashboard')
-    
-    # Clear the session data after retrieving (optional, for security)
-    # request.session.pop('ai_analysis', None)
-    
+    # Drop the full result older sessions kept (only the id is stored now)
+    request.session.pop('ai_analysis', None)
+    if analysis_id is not None:
+        analysis = get_object_or_404(AnalysisResult, id=analysis_id, user=request.user)
+    else:
+        session_id = request.session.get('ai_analysis_id')
+        analysis = AnalysisResult.objects.filter(id=session_id, user=request.user).first() if session_id else None
+        if analysis is None:
+            # If no analysis in session, redirect to dashboard
+            return redirect('dashboard')
+
+    ai_data = analysis.data
+    study_plan = ai_data.get('study_plan', {})
     context = {
         'analysis': ai_data,
+        'analysis_record': analysis,
         'top_companies': ai_data.get('top_companies', []),
-        'study_plan': ai_data.get('study_plan', {}),
+        'study_plan': study_plan,
+        'study_plan_items': [(key, study_plan.get(key)) for key in STUDY_PLAN_SECTIONS],
     }
     
     return render(request, 'ai_analysis_results.html', context)
+
+
+@login_required
+def ai_analysis_history(request):
+    """
+    List the user's past AI analyses, newest first.
+    """
+    analyses = (
+        AnalysisResult.objects.filter(user=request.user)
+        .defer('payload')
+        .select_related('document')
+    )
+    return render(request, 'ai_analysis_history.html', {'analyses': analyses})
@@ -0,0 +1,176 @@
+"""
+Process warm-up after a deploy.
+
+The first requests to a fresh web process otherwise pay for compiling the
+templates, importing pypdf and initializing xhtml2pdf/reportlab (fonts,
+CSS parser). ``run_warmup`` does all of that up front:
+
+- compiles every template under the project's template directories,
+- imports the PDF libraries (app/lazy_libs.py),
+- renders one throwaway PDF per resume template.
+
+With ``WARMUP_ON_STARTUP`` each web process runs it in a background thread
+started by its first request (usually the load balancer's readiness probe),
+and the readiness endpoint reports 503 until it has finished. It isn't
+started when the WSGI/ASGI module is imported: under gunicorn ``--preload``
+that happens in the master, and workers forked mid-warm-up would inherit a
+"running" state with no thread behind it (and possibly held locks).
+``manage.py warmup`` runs the same steps in the foreground.
+"""
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+from django.utils import timezone
+
+from . import lazy_libs
+from .resume_context import RESUME_TEMPLATES
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+_state = {"status": PENDING, "started_at": None, "finished_at": None, "timings": {}, "error": ""}
+_state_lock = threading.Lock()
+_thread = None
+
+
+def _update(**changes):
+    with _state_lock:
+        _state.update(changes)
+
+
+def warmup_state():
+    with _state_lock:
+        state = dict(_state)
+    state["timings"] = dict(state["timings"])
+    return state
+
+
+def project_templates():
+    """(engine, template name) for each .html file in the project's template dirs."""
+    base_dir = Path(settings.BASE_DIR).resolve()
+    for engine in engines.all():
+        # With explicit loaders (APP_DIRS off) template_dirs leaves out the
+        # app directories the app_directories loader reads from.
+        directories = dict.fromkeys(
+            Path(directory).resolve()
+            for directory in [*engine.template_dirs, *get_app_template_dirs("templates")]
+        )
+        for directory in directories:
+            # Skip templates shipped with installed packages (admin etc.)
+            if not directory.is_dir() or base_dir not in directory.parents:
+                continue
+            for path in sorted(directory.rglob("*.html")):
+                yield engine, path.relative_to(directory).as_posix()
+
+
+def compile_templates():
+    count = 0
+    for engine, name in project_templates():
+        engine.get_template(name)
+        count += 1
+    return count
+
+
+def sample_resume():
+    """An unsaved resume with every section filled in."""
+    from .models import Resume
+
+    return Resume(
+        id=0,
+        full_name="Warm Up",
+        email="warmup@example.com",
+        mobile="0000000000",
+        career_objective="Warm-up render.",
+        edu_qualification="B.E.\nHSC",
+        edu_year="2020\n2016",
+        edu_college="College\nSchool",
+        edu_university="University\nBoard",
+        edu_cgpa="8.0\n80%",
+        edu_class="First\nFirst",
+        skills="Python\nDjango",
+        projects="Project one\nProject two",
+        achievements="Achievement",
+        certifications="Certification",
+        languages="English",
+        hobbies="Reading",
+    )
+
+
+def import_pdf_libraries():
+    lazy_libs.pypdf()
+    lazy_libs.pisa()
+
+
+def render_sample_pdfs():
+    from .pdf_render import render_resume_pdf
+
+    resume = sample_resume()
+    for slug in RESUME_TEMPLATES:
+        render_resume_pdf(resume, slug)
+    return len(RESUME_TEMPLATES)
+
+
+def run_warmup(pdf=True):
+    """Run the warm-up steps; returns ``{step: seconds}``."""
+    steps = [("templates", compile_templates), ("pdf_libs", import_pdf_libraries)]
+    if pdf:
+        steps.append(("pdf", render_sample_pdfs))
+
+    _update(status=RUNNING, started_at=timezone.now(), finished_at=None, timings={}, error="")
+    timings = {}
+    try:
+        for name, step in steps:
+            start = time.perf_counter()
+            step()
+            timings[name] = time.perf_counter() - start
+            _update(timings=dict(timings))
+    except Exception as e:
+        _update(status=FAILED, finished_at=timezone.now(), error=f"{name}: {e}")
+        raise
+    _update(status=READY, finished_at=timezone.now())
+    return timings
+
+
+def start_warmup():
+    """Run the warm-up once per process in a background thread."""
+    global _thread
+    with _state_lock:
+        if _thread is not None:
+            return _thread
+        _thread = threading.Thread(target=_run_quietly, name="warmup", daemon=True)
+    _thread.start()
+    return _thread
+
+
+def _run_quietly():
+    try:
+        run_warmup(pdf=getattr(settings, "WARMUP_RENDER_PDF", True))
+    except Exception:
+        pass  # recorded in the state; the readiness endpoint reports it
+
+
+def _start_on_request(**kwargs):
+    if _thread is None:
+        start_warmup()
+
+
+def maybe_start_warmup():
+    """
+    Startup hook for the WSGI/ASGI entry points: the warm-up starts on the
+    process's first request, so every (forked) worker runs its own.
+    """
+    if getattr(settings, "WARMUP_ON_STARTUP", False):
+        request_started.connect(_start_on_request, dispatch_uid="app.warmup")
+
+
+def is_ready():
+    if not getattr(settings, "WARMUP_ON_STARTUP", False) and _thread is None:
+        return True
+    return warmup_state()["status"] == READY
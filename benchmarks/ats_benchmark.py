@@ -0,0 +1,118 @@
+"""
+Benchmark the compiled ATS scorer (app/ats.py) against the original
+per-keyword substring implementation that used to live in app/views.py.
+
+    python benchmarks/ats_benchmark.py
+    python benchmarks/ats_benchmark.py --resumes 5000 --extra-keywords 300
+
+``--extra-keywords`` pads the keyword dictionary with synthetic terms to show
+how both approaches scale as the dictionaries grow.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.ats import ATSScorer, DEFAULT_DICTIONARIES_PATH  # noqa: E402
+
+
+def legacy_score(text, sections, keywords):
+    """The original app.views._calculate_ats_score_from_text, parameterized."""
+    if not text:
+        return 0
+
+    text_lower = text.lower()
+    score = 0.0
+
+    per_section = 40.0 / len(sections)
+    for s in sections:
+        if s in text_lower:
+            score += per_section
+
+    per_kw = 40.0 / len(keywords)
+    found_keywords = 0
+    for kw in keywords:
+        if kw in text_lower:
+            found_keywords += 1
+    score += min(found_keywords * per_kw, 40.0)
+
+    words = re.findall(r"\w+", text_lower)
+    word_count = len(words)
+    if 300 <= word_count <= 1200:
+        score += 20.0
+    elif 150 <= word_count < 300 or 1200 < word_count <= 2000:
+        score += 10.0
+
+    return int(max(0, min(100, round(score))))
+
+
+FILLER = (
+    "led built designed implemented managed team project data digital "
+    "platform customers using with for and the of to in on developed "
+    "improved reduced latency pipeline service api backend frontend "
+    "university college intern internship responsible delivered"
+).split()
+
+
+def make_resumes(count, vocabulary, seed=42):
+    rng = random.Random(seed)
+    resumes = []
+    for _ in range(count):
+        length = rng.randint(120, 1600)
+        words = [
+            rng.choice(vocabulary) if rng.random() < 0.08 else rng.choice(FILLER)
+            for _ in range(length)
+        ]
+        resumes.append(" ".join(words).capitalize() + ".")
+    return resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--extra-keywords", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(DEFAULT_DICTIONARIES_PATH, encoding="utf-8") as fh:
+        data = json.load(fh)
+    categories = {c["name"]: c for c in data["categories"]}
+    extra = ["skill%d" % i for i in range(args.extra_keywords)]
+    categories["keywords"]["terms"] = categories["keywords"]["terms"] + extra
+
+    sections = categories["sections"]["terms"]
+    keywords = categories["keywords"]["terms"]
+    scorer = ATSScorer.from_dict(data)
+
+    texts = make_resumes(args.resumes, sections + keywords)
+
+    def best_of(fn):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    legacy_time = best_of(lambda: [legacy_score(t, sections, keywords) for t in texts])
+    engine_time = best_of(lambda: scorer.score_many(texts))
+
+    legacy_scores = [legacy_score(t, sections, keywords) for t in texts]
+    engine_scores = [r.score for r in scorer.score_many(texts)]
+    differing = sum(1 for a, b in zip(legacy_scores, engine_scores) if a != b)
+
+    print("resumes:           %d" % len(texts))
+    print("dictionary terms:  %d" % (len(sections) + len(keywords)))
+    print("legacy:            %.1f us/resume" % (legacy_time / len(texts) * 1e6))
+    print("compiled engine:   %.1f us/resume" % (engine_time / len(texts) * 1e6))
+    print("speedup:           %.2fx" % (legacy_time / engine_time))
+    print("differing scores:  %d (substring vs whole-word matches)" % differing)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measure how much app/text_compaction.py shrinks resume text before it is
+put into the Gemini prompt.
+
+    python benchmarks/compaction_benchmark.py
+    python benchmarks/compaction_benchmark.py --budget 1500
+    python benchmarks/compaction_benchmark.py path/to/resume.pdf ...
+
+Without PDF arguments, synthetic multi-page resumes are generated with the
+usual extraction noise: repeated page headers/footers, page numbers,
+hyphenation breaks, whitespace runs and assorted bullet glyphs.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.extraction import PAGE_BREAK  # noqa: E402
+from app.text_compaction import compact_text, estimate_tokens_for_chars  # noqa: E402
+
+SECTIONS = ["Summary", "Skills", "Experience", "Projects", "Education", "Certifications", "Hobbies", "Declaration"]
+BULLETS = ["•", "●", "▪", "-", "*", "➢", ""]
+WORDS = (
+    "led built designed implemented managed team project data digital "
+    "platform customers using with for and the of to in on developed "
+    "improved reduced latency pipeline service api backend frontend "
+    "python django react sql aws docker kubernetes analytics dashboards"
+).split()
+
+
+def make_resume(rng, pages):
+    name = "Candidate %d" % rng.randint(1, 9999)
+    lines = [name, "candidate@example.com  |  +91 98765 43210  |  Pune"]
+    for section in SECTIONS:
+        lines.append(section.upper() if rng.random() < 0.5 else section)
+        for _ in range(rng.randint(3, 12)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(6, 18))]
+            line = rng.choice(BULLETS) + "   " + "  ".join(words)
+            if rng.random() < 0.15:
+                line += " engi-\nneering"
+            lines.append(line)
+        lines.append("")
+    per_page = max(1, len(lines) // pages)
+    out = []
+    for page in range(pages):
+        body = lines[page * per_page:(page + 1) * per_page if page < pages - 1 else None]
+        out.append("\n".join([name + " - Resume", *body, "", "Page %d of %d" % (page + 1, pages)]))
+    return PAGE_BREAK.join(out)
+
+
+def extract_pdf(path):
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return PAGE_BREAK.join(page.extract_text() or "" for page in reader.pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdfs", nargs="*", help="Resume PDFs to measure instead of synthetic text.")
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--budget", type=int, default=3000, help="Token budget (AI_PROMPT_TOKEN_BUDGET).")
+    args = parser.parse_args()
+
+    if args.pdfs:
+        texts = [extract_pdf(path) for path in args.pdfs]
+    else:
+        rng = random.Random(42)
+        texts = [make_resume(rng, args.pages) for _ in range(args.resumes)]
+
+    start = time.perf_counter()
+    results = [compact_text(text, token_budget=args.budget) for text in texts]
+    elapsed = time.perf_counter() - start
+
+    original = sum(r.original_chars for r in results)
+    compacted = sum(r.compacted_chars for r in results)
+    capped = sum(1 for r in results if r.truncated)
+
+    print("resumes:            %d" % len(results))
+    print("token budget:       %d" % args.budget)
+    print("input:              %.0f chars / ~%.0f tokens per resume"
+          % (original / len(results), estimate_tokens_for_chars(original) / len(results)))
+    print("compacted:          %.0f chars / ~%.0f tokens per resume"
+          % (compacted / len(results), estimate_tokens_for_chars(compacted) / len(results)))
+    print("reduction:          %.1f%%" % ((1 - compacted / original) * 100 if original else 0))
+    print("capped at budget:   %d" % capped)
+    print("compaction time:    %.1f us/resume" % (elapsed / len(results) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Measure what a fresh process pays to boot the project, and check that the
+heavy libraries (app/lazy_libs.py HEAVY_MODULES) stay out of it.
+
+    python benchmarks/import_benchmark.py
+    python benchmarks/import_benchmark.py --runs 10 --settings resume_generator.settings_production
+
+Each run starts a new interpreter under ``python -X importtime`` that calls
+``django.setup()``, imports the URLconf (and with it every view) and every
+management command module, i.e. what a web worker, a migration or
+``manage.py <command>`` loads before doing any work. The wall time is the
+median over the runs. The deferred cost is how long the heavy libraries take
+to import on top of that; it is paid by the first request that needs them
+(or by the startup warm-up, see app/warmup.py).
+
+Exits with status 1 if any heavy module is imported during boot.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.lazy_libs import HEAVY_MODULES  # noqa: E402
+
+BOOT = """
+import importlib, pkgutil
+import django
+django.setup()
+from django.conf import settings
+importlib.import_module(settings.ROOT_URLCONF)
+import app.management.commands as commands
+for module in pkgutil.iter_modules(commands.__path__):
+    importlib.import_module(commands.__name__ + "." + module.name)
+"""
+
+DEFERRED = BOOT + """
+import time
+start = time.perf_counter()
+from app import lazy_libs
+lazy_libs.pisa(); lazy_libs.pypdf(); lazy_libs.genai()
+print(time.perf_counter() - start)
+"""
+
+
+def run(code, settings_module, importtime=False):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.exit(f"Boot failed:\n{result.stderr[-2000:]}")
+    return elapsed, result
+
+
+def parse_importtime(stderr):
+    """[(name, self_us, cumulative_us, indent)] from ``-X importtime`` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us), len(name) - len(name.lstrip())))
+    return modules
+
+
+def heavy_package(name):
+    """The HEAVY_MODULES entry ``name`` belongs to, or None."""
+    for heavy in HEAVY_MODULES:
+        if name == heavy or name.startswith(heavy + "."):
+            return heavy
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--settings", default=os.environ.get("DJANGO_SETTINGS_MODULE", "resume_generator.settings"))
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list.")
+    args = parser.parse_args()
+
+    _, result = run(BOOT, args.settings, importtime=True)
+    modules = parse_importtime(result.stderr)
+    top_level = [m for m in modules if m[3] == 1]
+    heavy = sorted({heavy_package(name) for name, *_ in modules} - {None})
+
+    walls = [run(BOOT, args.settings)[0] for _ in range(args.runs)]
+    deferred = float(run(DEFERRED, args.settings)[1].stdout.strip().splitlines()[-1])
+
+    print("settings:           %s" % args.settings)
+    print("modules imported:   %d" % len(modules))
+    print("import time:        %.0f ms" % (sum(m[2] for m in top_level) / 1000))
+    print("boot wall time:     %.0f ms (median of %d, min %.0f ms)"
+          % (statistics.median(walls) * 1000, len(walls), min(walls) * 1000))
+    print("deferred imports:   %.0f ms (%s)" % (deferred * 1000, ", ".join(HEAVY_MODULES)))
+    print()
+    print("slowest top-level imports:")
+    for name, _, cumulative, _ in sorted(top_level, key=lambda m: -m[2])[:args.top]:
+        print("  %8.1f ms  %s" % (cumulative / 1000, name))
+
+    if heavy:
+        print()
+        print("FAIL: heavy modules imported at boot: %s" % ", ".join(heavy))
+        print("Load them through app/lazy_libs.py where they are used.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
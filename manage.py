@@ -21,31 +21,33 @@ def main():
 if __name__ == '__main__':
     main()
 
-from app.models import ResumeTemplate
+    # Seed the template gallery. Kept under the __main__ guard so processes
+    # that re-import this module (multiprocessing "spawn" workers) skip it.
+    from app.models import ResumeTemplate
 
-templates = [
-    {
-        "name": "Modern Tech",
-        "slug": "modern-tech",
-        "description": "Clean, developer-friendly with skill-focused typography"
-    },
-    {
-        "name": "Professional Classic",
-        "slug": "professional-classic",
-        "description": "Traditional layout ideal for corporate roles"
-    },
-    {
-        "name": "Amrutvahini College",
-        "slug": "creative-minimal",
-        "description": "Minimal modern layout"
-    },
-]
+    templates = [
+        {
+            "name": "Modern Tech",
+            "slug": "modern-tech",
+            "description": "Clean, developer-friendly with skill-focused typography"
+        },
+        {
+            "name": "Professional Classic",
+            "slug": "professional-classic",
+            "description": "Traditional layout ideal for corporate roles"
+        },
+        {
+            "name": "Amrutvahini College",
+            "slug": "creative-minimal",
+            "description": "Minimal modern layout"
+        },
+    ]
 
-for t in templates:
-    ResumeTemplate.objects.get_or_create(
-        slug=t["slug"],
-        defaults={
-            "name": t["name"],
-            "description": t["description"]
-        }
-    )
+    for t in templates:
+        ResumeTemplate.objects.get_or_create(
+            slug=t["slug"],
+            defaults={
+                "name": t["name"],
+                "description": t["description"]
+            }
+        )
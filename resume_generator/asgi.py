@@ -14,3 +14,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_generator.settings')
 
 application = get_asgi_application()
+
+# Compile templates and initialize the PDF renderer in the background, from
+# each process's first request, when WARMUP_ON_STARTUP is set; /ready/
+# reports 503 until that has finished.
+from app.warmup import maybe_start_warmup  # noqa: E402
+
+maybe_start_warmup()
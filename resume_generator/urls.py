@@ -17,7 +17,7 @@ Including another URLconf
 from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from app.views import home
+from app.views import home, serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -30,8 +30,7 @@ urlpatterns = [
     
 
 
-]
-from django.conf import settings
-from django.conf.urls.static import static
+    # Uploaded media, with access control (app/media_serving.py)
+    path(settings.MEDIA_URL.lstrip("/") + "<path:path>", serve_media, name="media"),
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+]
\ No newline at end of file